@@ -1,8 +1,70 @@
+import copy
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple, Type, Union
 from crewai import Agent
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import BaseMessage
 from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, ValidationError
+from openai import DefaultHttpxClient
 from config.config import Config
 
+# A prompt string, or a list of messages (e.g. static system + per-request user message)
+Prompt = Union[str, List[BaseMessage]]
+
+# Line prefixes of list items, which are never treated as section headers
+_BULLET_PREFIXES = ("-", "•", "–", "* ")
+
+@lru_cache(maxsize=256)
+def bullet_list(items: Tuple[str, ...]) -> str:
+    """Format items as a "- item" list for a prompt; a repeated list is formatted once"""
+    return "\n".join(f"- {item}" for item in items)
+
+# Leading list bullet of a line ("- ", "* ", "• ", "– "); a "*" needs the space,
+# so bold markdown ("**Title**") is not mistaken for a bullet
+_BULLET_RE = re.compile(r'\s*(?:(?:[-•–]|\*(?=\s))\s*)?')
+
+def strip_bullet(item: str) -> str:
+    """Return a list item without its leading bullet (any of -, *, •, –) and surrounding whitespace"""
+    return item[_BULLET_RE.match(item).end():].rstrip()
+
+# First number of up to three digits in a score line ("85", "**78**/100", "92%")
+_SCORE_RE = re.compile(r'(?<!\d)\d{1,3}(?!\d)')
+
+def parse_score(text: str) -> Optional[int]:
+    """Return the score in a line of an LLM response, or None if it has none"""
+    match = _SCORE_RE.search(text)
+    return int(match.group()) if match else None
+
+# Errors meaning the model could not give a valid structured answer, so a
+# plain-text answer is requested and parsed instead
+_STRUCTURED_FALLBACK_ERRORS = (NotImplementedError, OutputParserException, ValidationError)
+
+@lru_cache(maxsize=1)
+def _get_http_client() -> DefaultHttpxClient:
+    """Return the HTTP client (keep-alive connection pool) shared by every LLM client"""
+    return DefaultHttpxClient()
+
+@lru_cache(maxsize=8)
+def _get_llm(model_name: str, temperature: float, api_key: str) -> ChatOpenAI:
+    """Return the shared ChatOpenAI client for a model"""
+    return ChatOpenAI(
+        model_name=model_name,
+        temperature=temperature,
+        api_key=api_key,
+        http_client=_get_http_client()
+    )
+
 class BaseAgent:
+    # Fields required by validate_input; override in subclasses
+    _REQUIRED_FIELDS = frozenset()
+    
+    # Maximum number of LLM responses (or results built from them) kept per agent
+    response_cache_size = 128
+    
     def __init__(
         self,
         role: str,
@@ -24,18 +86,529 @@ class BaseAgent:
         self.backstory = backstory
         self.verbose = verbose
         
-        # Initialize the language model
-        self.llm = ChatOpenAI(
-            model_name=Config.DEFAULT_GPT_MODEL,
-            temperature=0.7,
-            api_key=Config.OPENAI_API_KEY
-        )
+        # Initialize the language models, shared by all agents using the same settings.
+        # fast_llm is a smaller, cheaper model for factual, low-creativity prompts.
+        self.llm = _get_llm(Config.DEFAULT_GPT_MODEL, 0.7, Config.OPENAI_API_KEY)
+        self.fast_llm = _get_llm(Config.FAST_GPT_MODEL, 0.3, Config.OPENAI_API_KEY)
+        
+        # LRU cache of LLM responses (or results parsed from them) for repeated requests
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
+        # Function-calling runnables built by _structured_llm, keyed by (llm id, schema)
+        self._structured_llms = {}
     
     def _log(self, message: str) -> None:
         """Log messages if verbose mode is enabled"""
         if self.verbose:
             print(f"[{self.role}] {message}")
     
+    @staticmethod
+    def _normalize_key(*parts) -> tuple:
+        """Normalize free-text inputs (case and whitespace) for use as a cache key"""
+        return tuple(" ".join(str(part).split()).lower() for part in parts)
+    
+    def _cache_get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached response for key (marking it recently used), or None"""
+        with self._response_cache_lock:
+            if key not in self._response_cache:
+                return None
+            self._response_cache.move_to_end(key)
+            return self._response_cache[key]
+    
+    def _cache_put(self, key: Hashable, response: Any) -> None:
+        """Store a response, evicting the least recently used entries past the size limit"""
+        with self._response_cache_lock:
+            self._response_cache[key] = response
+            while len(self._response_cache) > self.response_cache_size:
+                self._response_cache.popitem(last=False)  # Remove oldest item (LRU)
+    
+    def _cached_parse(self, parse: Callable[[str], Dict[str, List[str]]], response: str) -> Dict[str, List[str]]:
+        """
+        Parse a response, reusing the result when the same response is parsed again.
+        
+        For parsers returning a flat dict of lists, which is copied per call so
+        callers can modify their result without affecting the cache.
+        """
+        key = ("parsed", parse.__name__, response)
+        parsed = self._cache_get(key)
+        if parsed is None:
+            parsed = parse(response)
+            self._cache_put(key, parsed)
+        return {section: list(items) for section, items in parsed.items()}
+    
+    @staticmethod
+    def _group_lines(response: str, headers: Sequence[Tuple[str, str]]) -> Dict[str, List[str]]:
+        """
+        Group the lines of a sectioned LLM response under their headers in one pass.
+        
+        A line containing one of the header strings starts that section, and any
+        text after a colon on the header line becomes its first line. Other
+        non-empty lines belong to the current section; lines before the first
+        header are dropped.
+        
+        Args:
+            response (str): Raw LLM response
+            headers (Sequence[Tuple[str, str]]): (header text, section key) pairs,
+                checked in order
+            
+        Returns:
+            Dict[str, List[str]]: Stripped lines per section key, for the sections found
+        """
+        sections = {}
+        current = None
+        for line in response.splitlines():
+            current = BaseAgent._group_line(line, headers, sections, current)
+        
+        return sections
+    
+    @staticmethod
+    def _group_line(
+        line: str,
+        headers: Sequence[Tuple[str, str]],
+        sections: Dict[str, List[str]],
+        current: Optional[List[str]]
+    ) -> Optional[List[str]]:
+        """
+        Add one response line to ``sections`` as _group_lines does.
+        
+        Lets a response be grouped line by line while it is streamed. Pass the
+        returned list back in as ``current`` for the next line.
+        """
+        line = line.strip()
+        if not line:
+            return current
+        
+        if not line.startswith(_BULLET_PREFIXES):
+            for header, key in headers:
+                if header in line:
+                    current = sections.setdefault(key, [])
+                    rest = line.partition(":")[2].strip(" *")
+                    if rest:
+                        current.append(rest)
+                    return current
+        
+        if current is not None:
+            current.append(line)
+        return current
+    
+    def _cached_invoke(
+        self,
+        prompt: Prompt,
+        cache_key: Optional[Hashable] = None,
+        llm: Optional[Any] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Invoke the LLM and memoize the response content.
+        
+        Args:
+            prompt (Prompt): Fully formatted prompt or messages to send to the LLM
+            cache_key (Hashable): Key identifying the request; defaults to the prompt
+                itself, so it is required for message lists
+            llm: Chat model to use; defaults to self.llm
+            on_token (Callable[[str], None]): If given, the response is streamed and
+                each chunk of text is passed to it as it arrives; a cached response
+                is passed in one piece
+            
+        Returns:
+            str: The LLM response content
+        """
+        key = prompt if cache_key is None else cache_key
+        response = self._cache_get(key)
+        if response is not None:
+            self._log("Serving LLM response from cache")
+            if on_token:
+                on_token(response)
+            return response
+        
+        if on_token:
+            chunks = []
+            for chunk in (llm or self.llm).stream(prompt):
+                text = chunk.content
+                if text:
+                    chunks.append(text)
+                    on_token(text)
+            response = "".join(chunks)
+        else:
+            response = (llm or self.llm).invoke(prompt).content
+        self._cache_put(key, response)
+        return response
+    
+    async def _acached_invoke(
+        self,
+        prompt: Prompt,
+        cache_key: Optional[Hashable] = None,
+        llm: Optional[Any] = None
+    ) -> str:
+        """Async variant of _cached_invoke using ``llm.ainvoke``"""
+        key = prompt if cache_key is None else cache_key
+        response = self._cache_get(key)
+        if response is not None:
+            self._log("Serving LLM response from cache")
+            return response
+        
+        response = (await (llm or self.llm).ainvoke(prompt)).content
+        self._cache_put(key, response)
+        return response
+    
+    def _batch_invoke(
+        self,
+        prompts: List[Prompt],
+        cache_keys: Optional[List[Hashable]] = None,
+        llm: Optional[Any] = None
+    ) -> List[str]:
+        """
+        Invoke the LLM for several prompts at once, reusing cached responses.
+        
+        Prompts that miss the response cache are sent together through
+        ``llm.batch`` so their requests run concurrently instead of one after
+        another.
+        
+        Args:
+            prompts (List[Prompt]): Fully formatted prompts or message lists
+            cache_keys (List[Hashable]): Cache key per prompt; defaults to the prompts
+                (required for message lists)
+            llm: Chat model to use; defaults to self.llm
+            
+        Returns:
+            List[str]: LLM response content, in the same order as ``prompts``
+        """
+        keys = list(prompts) if cache_keys is None else list(cache_keys)
+        responses = [self._cache_get(key) for key in keys]
+        pending = [i for i, response in enumerate(responses) if response is None]
+        
+        if pending:
+            self._log(f"Batching {len(pending)} LLM requests ({len(prompts) - len(pending)} cached)")
+            results = (llm or self.llm).batch(
+                [prompts[i] for i in pending],
+                config={"max_concurrency": Config.LLM_MAX_CONCURRENCY}
+            )
+            for i, result in zip(pending, results):
+                responses[i] = result.content
+                self._cache_put(keys[i], result.content)
+        
+        return responses
+    
+    def _stream_lines(
+        self,
+        prompt: Prompt,
+        chunks: List[str],
+        llm: Optional[Any] = None
+    ) -> Iterator[str]:
+        """
+        Stream the LLM response and yield it line by line as lines complete.
+        
+        Lets a line-oriented parser run while the response is still being
+        generated. The raw chunks are appended to ``chunks`` so the caller can
+        rebuild the full response text afterwards.
+        
+        Args:
+            prompt (Prompt): Fully formatted prompt or messages to send to the LLM
+            chunks (List[str]): Receives the raw response chunks
+            llm: Chat model to use; defaults to self.llm
+        """
+        buffer = ""
+        for chunk in (llm or self.llm).stream(prompt):
+            text = chunk.content
+            if not text:
+                continue
+            chunks.append(text)
+            buffer += text
+            if "\n" in buffer:
+                *lines, buffer = buffer.split("\n")
+                yield from lines
+        if buffer:
+            yield buffer
+    
+    async def _astream_lines(
+        self,
+        prompt: Prompt,
+        chunks: List[str],
+        llm: Optional[Any] = None
+    ) -> AsyncIterator[str]:
+        """Async variant of _stream_lines using ``llm.astream``"""
+        buffer = ""
+        async for chunk in (llm or self.llm).astream(prompt):
+            text = chunk.content
+            if not text:
+                continue
+            chunks.append(text)
+            buffer += text
+            if "\n" in buffer:
+                *lines, buffer = buffer.split("\n")
+                for line in lines:
+                    yield line
+        if buffer:
+            yield buffer
+    
+    async def _abatch_invoke(
+        self,
+        prompts: List[Prompt],
+        cache_keys: Optional[List[Hashable]] = None,
+        llm: Optional[Any] = None
+    ) -> List[str]:
+        """Async variant of _batch_invoke using ``llm.abatch`` (bounded by LLM_MAX_CONCURRENCY)"""
+        keys = list(prompts) if cache_keys is None else list(cache_keys)
+        responses = [self._cache_get(key) for key in keys]
+        pending = [i for i, response in enumerate(responses) if response is None]
+        
+        if pending:
+            self._log(f"Batching {len(pending)} LLM requests ({len(prompts) - len(pending)} cached)")
+            results = await (llm or self.llm).abatch(
+                [prompts[i] for i in pending],
+                config={"max_concurrency": Config.LLM_MAX_CONCURRENCY}
+            )
+            for i, result in zip(pending, results):
+                responses[i] = result.content
+                self._cache_put(keys[i], result.content)
+        
+        return responses
+    
+    def _structured_llm(self, schema: Type[BaseModel], llm: Optional[Any] = None):
+        """Return (and reuse) the LLM bound to return ``schema`` via function calling"""
+        llm = llm or self.llm
+        key = (id(llm), schema)
+        if key not in self._structured_llms:
+            self._structured_llms[key] = llm.with_structured_output(schema, method="function_calling")
+        return self._structured_llms[key]
+    
+    def _structured_invoke(
+        self,
+        prompt: Prompt,
+        schema: Type[BaseModel],
+        llm: Optional[Any] = None
+    ) -> Optional[BaseModel]:
+        """
+        Invoke the LLM so that it answers with a validated ``schema`` instance.
+        
+        Args:
+            prompt (Prompt): Fully formatted prompt or messages to send to the LLM
+            schema (Type[BaseModel]): Pydantic model describing the expected answer
+            llm: Chat model to use; defaults to self.llm
+            
+        Returns:
+            Optional[BaseModel]: The parsed answer, or None when the model does not
+            support function calling or returns an invalid answer (unparseable tool
+            call, or arguments that fail schema validation), so callers can fall
+            back to parsing a plain-text response
+        """
+        try:
+            return self._structured_llm(schema, llm).invoke(prompt)
+        except _STRUCTURED_FALLBACK_ERRORS as e:
+            self._log(f"Structured output unavailable, falling back to text: {e}")
+            return None
+    
+    async def _astructured_invoke(
+        self,
+        prompt: Prompt,
+        schema: Type[BaseModel],
+        llm: Optional[Any] = None
+    ) -> Optional[BaseModel]:
+        """Async variant of _structured_invoke using ``ainvoke``"""
+        try:
+            return await self._structured_llm(schema, llm).ainvoke(prompt)
+        except _STRUCTURED_FALLBACK_ERRORS as e:
+            self._log(f"Structured output unavailable, falling back to text: {e}")
+            return None
+
+    def _structured_cache_get(
+        self,
+        cache_key: Hashable,
+        parse: Callable[[str], Dict]
+    ) -> Optional[Tuple[str, Dict]]:
+        """
+        An earlier answer to the request, structured or (parsed) text, if cached.
+        
+        Args:
+            cache_key (Hashable): Key identifying the request (see _structured_or_parsed)
+            parse (Callable[[str], Dict]): Parser for a plain-text answer
+            
+        Returns:
+            Optional[Tuple[str, Dict]]: The raw answer and its data, or None
+        """
+        cached = self._cache_get(("structured",) + cache_key)
+        if cached is not None:
+            self._log("Serving structured LLM response from cache")
+            return cached[0], copy.deepcopy(cached[1])
+        
+        response = self._cache_get(cache_key)
+        if response is not None:
+            self._log("Serving LLM response from cache")
+            return response, parse(response)
+        return None
+    
+    def _structured_cache_put(self, cache_key: Hashable, result: BaseModel) -> Tuple[str, Dict]:
+        """Cache a structured answer under ``("structured",) + cache_key``; returns its JSON and data"""
+        response, data = result.model_dump_json(), result.model_dump()
+        self._cache_put(("structured",) + cache_key, (response, copy.deepcopy(data)))
+        return response, data
+    
+    def _structured_batch_result(self, result: Any) -> Optional[BaseModel]:
+        """A structured batch item, or None if it needs the text fallback; other errors are raised"""
+        if isinstance(result, _STRUCTURED_FALLBACK_ERRORS):
+            self._log(f"Structured output unavailable, falling back to text: {result}")
+            return None
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    def _structured_or_parsed(
+        self,
+        prompt: Prompt,
+        schema: Type[BaseModel],
+        cache_key: Hashable,
+        parse: Callable[[str], Dict],
+        llm: Optional[Any] = None
+    ) -> Tuple[str, Dict]:
+        """
+        Get an answer as ``schema`` data, parsing a text answer only as a fallback.
+
+        Args:
+            prompt (Prompt): Fully formatted prompt or messages to send to the LLM
+            schema (Type[BaseModel]): Pydantic model describing the expected answer
+            cache_key (Hashable): Key identifying the request; structured answers
+                are cached under ``("structured",) + cache_key``, text answers under
+                ``cache_key`` itself, and either is reused
+            parse (Callable[[str], Dict]): Parser for a plain-text answer
+            llm: Chat model to use; defaults to self.llm
+
+        Returns:
+            Tuple[str, Dict]: The raw answer (JSON for structured answers) and its data
+        """
+        cached = self._structured_cache_get(cache_key, parse)
+        if cached is not None:
+            return cached
+
+        result = self._structured_invoke(prompt, schema, llm=llm)
+        if result is None:
+            response = self._cached_invoke(prompt, cache_key=cache_key, llm=llm)
+            return response, parse(response)
+
+        return self._structured_cache_put(cache_key, result)
+
+    async def _astructured_or_parsed(
+        self,
+        prompt: Prompt,
+        schema: Type[BaseModel],
+        cache_key: Hashable,
+        parse: Callable[[str], Dict],
+        llm: Optional[Any] = None
+    ) -> Tuple[str, Dict]:
+        """Async variant of _structured_or_parsed"""
+        cached = self._structured_cache_get(cache_key, parse)
+        if cached is not None:
+            return cached
+
+        result = await self._astructured_invoke(prompt, schema, llm=llm)
+        if result is None:
+            response = await self._acached_invoke(prompt, cache_key=cache_key, llm=llm)
+            return response, parse(response)
+
+        return self._structured_cache_put(cache_key, result)
+
+    def _structured_or_parsed_batch(
+        self,
+        prompts: List[Prompt],
+        schema: Type[BaseModel],
+        cache_keys: List[Hashable],
+        parse: Callable[[str], Dict],
+        llm: Optional[Any] = None
+    ) -> List[Tuple[str, Dict]]:
+        """
+        Batched _structured_or_parsed, sharing its cache entries.
+        
+        Requests that miss the cache are sent together through the structured
+        LLM's ``batch``; the ones without a valid structured answer are then
+        batched again as text requests and parsed.
+        
+        Args:
+            prompts (List[Prompt]): Fully formatted prompts or message lists
+            schema (Type[BaseModel]): Pydantic model describing the expected answers
+            cache_keys (List[Hashable]): Key identifying each request
+            parse (Callable[[str], Dict]): Parser for a plain-text answer
+            llm: Chat model to use; defaults to self.llm
+            
+        Returns:
+            List[Tuple[str, Dict]]: Raw answer and data, in the same order as ``prompts``
+        """
+        answers = [self._structured_cache_get(key, parse) for key in cache_keys]
+        pending = [i for i, answer in enumerate(answers) if answer is None]
+        if not pending:
+            return answers
+        
+        self._log(f"Batching {len(pending)} structured LLM requests ({len(prompts) - len(pending)} cached)")
+        try:
+            results = self._structured_llm(schema, llm).batch(
+                [prompts[i] for i in pending],
+                config={"max_concurrency": Config.LLM_MAX_CONCURRENCY},
+                return_exceptions=True
+            )
+        except NotImplementedError as e:
+            results = [e] * len(pending)
+        
+        fallback = []
+        for i, result in zip(pending, results):
+            result = self._structured_batch_result(result)
+            if result is None:
+                fallback.append(i)
+            else:
+                answers[i] = self._structured_cache_put(cache_keys[i], result)
+        
+        if fallback:
+            responses = self._batch_invoke(
+                [prompts[i] for i in fallback],
+                cache_keys=[cache_keys[i] for i in fallback],
+                llm=llm
+            )
+            for i, response in zip(fallback, responses):
+                answers[i] = response, parse(response)
+        
+        return answers
+
+    async def _astructured_or_parsed_batch(
+        self,
+        prompts: List[Prompt],
+        schema: Type[BaseModel],
+        cache_keys: List[Hashable],
+        parse: Callable[[str], Dict],
+        llm: Optional[Any] = None
+    ) -> List[Tuple[str, Dict]]:
+        """Async variant of _structured_or_parsed_batch using ``abatch``"""
+        answers = [self._structured_cache_get(key, parse) for key in cache_keys]
+        pending = [i for i, answer in enumerate(answers) if answer is None]
+        if not pending:
+            return answers
+        
+        self._log(f"Batching {len(pending)} structured LLM requests ({len(prompts) - len(pending)} cached)")
+        try:
+            results = await self._structured_llm(schema, llm).abatch(
+                [prompts[i] for i in pending],
+                config={"max_concurrency": Config.LLM_MAX_CONCURRENCY},
+                return_exceptions=True
+            )
+        except NotImplementedError as e:
+            results = [e] * len(pending)
+        
+        fallback = []
+        for i, result in zip(pending, results):
+            result = self._structured_batch_result(result)
+            if result is None:
+                fallback.append(i)
+            else:
+                answers[i] = self._structured_cache_put(cache_keys[i], result)
+        
+        if fallback:
+            responses = await self._abatch_invoke(
+                [prompts[i] for i in fallback],
+                cache_keys=[cache_keys[i] for i in fallback],
+                llm=llm
+            )
+            for i, response in zip(fallback, responses):
+                answers[i] = response, parse(response)
+        
+        return answers
+
     def _format_error(self, error: Exception) -> str:
         """Format error messages consistently"""
         return f"Error in {self.role}: {str(error)}"
@@ -65,19 +638,18 @@ class BaseAgent:
         Returns:
             bool: True if valid, raises ValueError if invalid
         """
-        required_fields = self.get_required_fields()
-        missing_fields = [field for field in required_fields if field not in input_data]
+        missing_fields = self._REQUIRED_FIELDS.difference(input_data)
         
         if missing_fields:
-            raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
+            raise ValueError(f"Missing required fields: {', '.join(sorted(missing_fields))}")
         
         return True
     
     def get_required_fields(self) -> list:
         """
-        Get required fields for the agent. Override in subclasses.
+        Get required fields for the agent. Set _REQUIRED_FIELDS in subclasses.
         
         Returns:
             list: List of required field names
         """
-        return [] 
\ No newline at end of file
+        return sorted(self._REQUIRED_FIELDS)
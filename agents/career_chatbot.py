@@ -1,8 +1,82 @@
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+import tiktoken
 from .base_agent import BaseAgent
-from langchain.prompts import PromptTemplate
+from config.config import Config
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+# Static system instructions for the chatbot. Nothing user-specific goes in
+# here so every request starts with the same, provider-cacheable prefix.
+_CHAT_SYSTEM_PROMPT = """
+    You are a career advisor chatbot: an AI career counselor with expertise in
+    professional development and career guidance. Answer the user's
+    career-related questions using their background and the conversation so far.
+    
+    Please provide:
+    1. A helpful and informative response
+    2. Any relevant follow-up questions
+    3. Specific actionable advice when applicable
+    4. References to reliable resources when relevant
+    """
+
+_CHAT_PROMPT = """
+    User Context:
+    {user_context}
+    
+    User Query:
+    {user_query}
+    """
+
+_RESOURCE_PROMPT = """
+    Suggest high-quality resources for:
+    
+    Topic: {topic}
+    Resource Type: {resource_type}
+    
+    Please provide:
+    1. Top recommended resources
+    2. Brief description of each resource
+    3. Why it's valuable for this topic
+    4. How to best utilize the resource
+    """
+
+# Bound ``str.format`` of the templates above, called directly on the hot paths
+_CHAT_FMT = _CHAT_PROMPT.format
+_RESOURCE_FMT = _RESOURCE_PROMPT.format
+
+# Chat history window: it grows append-only up to _HISTORY_MAX_TURNS turns and
+# then restarts from the latest _HISTORY_MIN_TURNS, so consecutive prompts share
+# a prefix that the provider's prompt cache can reuse.
+_HISTORY_MIN_TURNS = 5
+_HISTORY_MAX_TURNS = 10
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Optional[tiktoken.Encoding]:
+    """Tokenizer of the chat model, or None if it cannot be loaded (e.g. offline)"""
+    try:
+        return tiktoken.encoding_for_model(Config.DEFAULT_GPT_MODEL)
+    except Exception:
+        return None
+
+@lru_cache(maxsize=1024)
+def _count_tokens(text: str) -> int:
+    """Token count of a chat message; history messages are counted once and reused"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1  # Rough estimate without the tokenizer
+    return len(encoding.encode(text))
+
+# Terms used to classify chatbot response sections (matched on lowercased text)
+_RESOURCE_TERMS = ("resource", "reference")
+_ACTION_TERMS = ("should", "could", "try", "consider", "recommend")
 
 class CareerChatbotAgent(BaseAgent):
+    # Fields required by validate_input
+    _REQUIRED_FIELDS = frozenset({"user_query"})
+    
+    chat_prompt = _CHAT_PROMPT
+    resource_prompt = _RESOURCE_PROMPT
+    
     def __init__(self, verbose: bool = False):
         super().__init__(
             role="Career Advisor Chatbot",
@@ -10,90 +84,73 @@ class CareerChatbotAgent(BaseAgent):
             backstory="AI career counselor with expertise in professional development and career guidance",
             verbose=verbose
         )
-        
-        self.chat_prompt = PromptTemplate(
-            input_variables=["chat_history", "user_query", "user_context"],
-            template="""
-            Previous conversation:
-            {chat_history}
-            
-            User Context:
-            {user_context}
-            
-            User Query:
-            {user_query}
-            
-            Please provide:
-            1. A helpful and informative response
-            2. Any relevant follow-up questions
-            3. Specific actionable advice when applicable
-            4. References to reliable resources when relevant
-            """
-        )
-        
-        self.resource_prompt = PromptTemplate(
-            input_variables=["topic", "resource_type"],
-            template="""
-            Suggest high-quality resources for:
-            
-            Topic: {topic}
-            Resource Type: {resource_type}
-            
-            Please provide:
-            1. Top recommended resources
-            2. Brief description of each resource
-            3. Why it's valuable for this topic
-            4. How to best utilize the resource
-            """
-        )
     
     def get_response(
         self,
         user_query: str,
         chat_history: List[Dict] = None,
-        user_context: Optional[Dict] = None
+        user_context: Optional[Dict] = None,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> Dict:
         """
         Generate a response to a user's career-related query
         
+        The response is streamed from the LLM and parsed section by section
+        while it is still being generated.
+        
         Args:
             user_query (str): User's question or input
             chat_history (List[Dict]): Previous conversation history
             user_context (Dict): User's background information
+            on_token (Callable[[str], None]): Called with each chunk of text as it arrives
             
         Returns:
             Dict: Chatbot response and suggestions
         """
         try:
-            # Format chat history
-            history_text = ""
+            # Static system prompt first, then the current history window as
+            # conversation turns, so the prompt prefix stays stable between calls
+            messages = [SystemMessage(content=_CHAT_SYSTEM_PROMPT)]
             if chat_history:
-                history_text = "\n".join([
-                    f"User: {msg['user']}\nBot: {msg['bot']}"
-                    for msg in chat_history[-5:]  # Keep last 5 messages for context
-                ])
+                for msg in self._prompt_history(chat_history):
+                    messages.append(HumanMessage(content=msg["user"]))
+                    messages.append(AIMessage(content=msg["bot"]))
             
             # Format user context
             context_text = ""
             if user_context:
-                context_text = "\n".join([
+                context_text = "\n".join(
                     f"{key}: {value}"
                     for key, value in user_context.items()
-                ])
-            
-            # Generate response using LLM
-            response = self.llm.invoke(
-                self.chat_prompt.format(
-                    chat_history=history_text,
-                    user_query=user_query,
-                    user_context=context_text
                 )
-            ).content
             
-            # Parse and structure the response
+            # The per-request context and query go in the final user message
+            messages.append(HumanMessage(content=_CHAT_FMT(
+                user_query=user_query,
+                user_context=context_text
+            )))
+            
+            # Stream the response, parsing each section once it is complete
+            parsed_data = self._new_chat_response()
+            chunks = []
+            buffer = ""
+            for chunk in self.llm.stream(messages):
+                text = chunk.content
+                if not text:
+                    continue
+                chunks.append(text)
+                if on_token:
+                    on_token(text)
+                
+                buffer += text
+                while "\n\n" in buffer:
+                    section, _, buffer = buffer.partition("\n\n")
+                    self._parse_chat_section(section, parsed_data)
+            self._parse_chat_section(buffer, parsed_data)
+            
             chat_response = {
-                "raw_response": response,
-                "structured_data": self._parse_chat_response(response)
+                "raw_response": "".join(chunks),
+                "structured_data": parsed_data
             }
             
             self._log("Generated chat response")
@@ -104,6 +161,49 @@ class CareerChatbotAgent(BaseAgent):
             self._log(error_msg)
             raise ValueError(error_msg)
     
+    @staticmethod
+    def _history_window_start(history_length: int) -> int:
+        """
+        Index of the first chat turn to include in the prompt.
+        
+        The start only moves once the window exceeds _HISTORY_MAX_TURNS, and
+        then jumps so that the latest _HISTORY_MIN_TURNS are kept. Being a pure
+        function of the history length, no per-session state is needed.
+        """
+        if history_length <= _HISTORY_MAX_TURNS:
+            return 0
+        step = _HISTORY_MAX_TURNS - _HISTORY_MIN_TURNS + 1
+        return ((history_length - _HISTORY_MAX_TURNS - 1) // step + 1) * step
+    
+    def _prompt_history(self, chat_history: List[Dict]) -> List[Dict]:
+        """The chat turns sent with a question: the turn window, within the token budget"""
+        chat_history = chat_history[self._history_window_start(len(chat_history)):]
+        return chat_history[self._history_budget_start(chat_history):]
+    
+    @staticmethod
+    def _history_budget_start(chat_history: List[Dict]) -> int:
+        """
+        Index of the first chat turn to include within Config.CHAT_HISTORY_TOKEN_BUDGET.
+        
+        Like the turn window, the start stays put while the history grows and
+        only moves once the budget is exceeded. It then jumps past whole leading
+        turns until the rest fits half of the budget, so the next turns are
+        appended to an unchanged prefix again. The turns are replayed from the
+        start of the window, so no per-session state is needed, and long
+        messages cannot push the prompt past the model's context window.
+        """
+        start = 0
+        tokens = 0
+        turn_tokens = []
+        for i, msg in enumerate(chat_history):
+            turn_tokens.append(_count_tokens(msg["user"]) + _count_tokens(msg["bot"]))
+            tokens += turn_tokens[i]
+            if tokens > Config.CHAT_HISTORY_TOKEN_BUDGET:
+                while start <= i and tokens > Config.CHAT_HISTORY_TOKEN_BUDGET // 2:
+                    tokens -= turn_tokens[start]
+                    start += 1
+        return start
+    
     def suggest_resources(
         self,
         topic: str,
@@ -121,12 +221,14 @@ class CareerChatbotAgent(BaseAgent):
         """
         try:
             # Get resource suggestions from LLM
-            response = self.llm.invoke(
-                self.resource_prompt.format(
+            response = self._cached_invoke(
+                _RESOURCE_FMT(
                     topic=topic,
                     resource_type=resource_type
-                )
-            ).content
+                ),
+                cache_key=("suggest_resources",) + self._normalize_key(topic, resource_type),
+                llm=self.fast_llm
+            )
             
             # Parse and structure the response
             resources = {
@@ -144,33 +246,40 @@ class CareerChatbotAgent(BaseAgent):
     
     def _parse_chat_response(self, response: str) -> Dict:
         """Parse the chatbot response"""
-        sections = response.split("\n\n")
-        parsed_data = {
+        parsed_data = self._new_chat_response()
+        for section in response.split("\n\n"):
+            self._parse_chat_section(section, parsed_data)
+        return parsed_data
+    
+    def _new_chat_response(self) -> Dict:
+        """Create an empty parsed chatbot response"""
+        return {
             "main_response": "",
             "follow_up_questions": [],
             "actionable_advice": [],
             "resources": []
         }
+    
+    def _parse_chat_section(self, section: str, parsed_data: Dict) -> None:
+        """Parse one blank-line separated section of a chatbot response into parsed_data"""
+        if "?" in section:
+            parsed_data["follow_up_questions"].extend(
+                q.strip() for q in section.split("\n") if "?" in q
+            )
+            return
         
-        current_section = "main_response"
-        for section in sections:
-            if "?" in section:
-                parsed_data["follow_up_questions"].extend(
-                    q.strip() for q in section.split("\n") if "?" in q
-                )
-            elif "resource" in section.lower() or "reference" in section.lower():
-                parsed_data["resources"].extend(
-                    r.strip("- ") for r in section.split("\n") if r.strip("- ")
-                )
-            elif any(action_word in section.lower() for action_word in ["should", "could", "try", "consider", "recommend"]):
-                parsed_data["actionable_advice"].extend(
-                    a.strip("- ") for a in section.split("\n") if a.strip("- ")
-                )
-            else:
-                if not parsed_data["main_response"]:
-                    parsed_data["main_response"] = section.strip()
-        
-        return parsed_data
+        section_lower = section.lower()
+        if any(term in section_lower for term in _RESOURCE_TERMS):
+            parsed_data["resources"].extend(
+                item for item in (r.strip("- ") for r in section.split("\n")) if item
+            )
+        elif any(term in section_lower for term in _ACTION_TERMS):
+            parsed_data["actionable_advice"].extend(
+                item for item in (a.strip("- ") for a in section.split("\n")) if item
+            )
+        else:
+            if not parsed_data["main_response"]:
+                parsed_data["main_response"] = section.strip()
     
     def _parse_resources(self, response: str) -> Dict:
         """Parse the resource suggestions"""
@@ -184,21 +293,18 @@ class CareerChatbotAgent(BaseAgent):
         
         current_resource = None
         for section in sections:
-            if section.startswith("1.") or section.startswith("-"):
+            if section.startswith(("1.", "-")):
                 # This is a resource name
                 resource = section.strip("1.- ").split("\n")[0]
                 parsed_data["recommended_resources"].append(resource)
                 current_resource = resource
             elif current_resource:
-                if "why" in section.lower():
-                    parsed_data["value_props"][current_resource] = section.split("\n", 1)[1].strip()
-                elif "how" in section.lower():
-                    parsed_data["usage_tips"][current_resource] = section.split("\n", 1)[1].strip()
+                section_lower = section.lower()
+                if "why" in section_lower:
+                    parsed_data["value_props"][current_resource] = section.partition("\n")[2].strip()
+                elif "how" in section_lower:
+                    parsed_data["usage_tips"][current_resource] = section.partition("\n")[2].strip()
                 else:
                     parsed_data["descriptions"][current_resource] = section.strip()
         
         return parsed_data
-    
-    def get_required_fields(self) -> List[str]:
-        """Get required fields for chatbot interaction"""
-        return ["user_query"] 
\ No newline at end of file
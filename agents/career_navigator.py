@@ -1,108 +1,211 @@
-from typing import Dict, List
+import copy
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 from .base_agent import BaseAgent
-from langchain.prompts import PromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
 import re
 
-class CareerNavigatorAgent(BaseAgent):
-    def __init__(self, verbose: bool = False):
-        super().__init__(
-            role="Career Navigator",
-            goal="Create personalized career paths and progression strategies",
-            backstory="Expert in career planning and professional development",
-            verbose=verbose
-        )
-        
-        self.career_path_prompt = PromptTemplate(
-            input_variables=["current_role", "experience", "skills", "interests", "goals"],
-            template="""
-            Based on the following profile, create a detailed career development plan:
+class RequiredSkills(BaseModel):
+    """Skills and certifications needed for the recommended paths"""
+    technical: List[str] = Field(default_factory=list, description="Technical skills to develop")
+    soft: List[str] = Field(default_factory=list, description="Soft skills to develop")
+    certifications: List[str] = Field(default_factory=list, description="Recommended certifications")
 
-            CURRENT PROFILE:
-            - Role: {current_role}
-            - Experience: {experience}
-            - Skills: {skills}
-            - Interests: {interests}
-            - Career Goals: {goals}
+class CareerPathResponse(BaseModel):
+    """Structured career development plan"""
+    path_options: List[str] = Field(default_factory=list, description="Career paths with role progression")
+    timeline: List[str] = Field(default_factory=list, description="Short-, medium- and long-term milestones")
+    challenges: List[str] = Field(default_factory=list, description="Potential challenges")
+    solutions: List[str] = Field(default_factory=list, description="One solution per challenge, in the same order")
+    trends: List[str] = Field(default_factory=list, description="Industry trends and opportunities")
+    required_skills: RequiredSkills = Field(default_factory=RequiredSkills)
 
-            Please provide a structured analysis in the following format:
+# Static instructions go in the system message and the per-request profile in
+# the user message, so every request shares a provider-cacheable prompt prefix.
+_CAREER_PATH_SYSTEM_PROMPT = """
+    Based on the user's profile, create a detailed career development plan.
 
-            CAREER PATH OPTIONS:
-            1. [Path 1 with role progression]
-            2. [Path 2 with role progression]
-            3. [Path 3 with role progression]
+    Please provide a structured analysis in the following format:
 
-            DEVELOPMENT TIMELINE:
-            - Short-term (0-2 years): [Specific milestones and objectives]
-            - Medium-term (2-5 years): [Specific milestones and objectives]
-            - Long-term (5+ years): [Specific milestones and objectives]
+    CAREER PATH OPTIONS:
+    1. [Path 1 with role progression]
+    2. [Path 2 with role progression]
+    3. [Path 3 with role progression]
 
-            POTENTIAL CHALLENGES AND SOLUTIONS:
-            Challenge 1: [Specific challenge]
-            Solution 1: [Detailed solution]
-            Challenge 2: [Specific challenge]
-            Solution 2: [Detailed solution]
+    DEVELOPMENT TIMELINE:
+    - Short-term (0-2 years): [Specific milestones and objectives]
+    - Medium-term (2-5 years): [Specific milestones and objectives]
+    - Long-term (5+ years): [Specific milestones and objectives]
 
-            INDUSTRY TRENDS AND OPPORTUNITIES:
-            1. [Current trend and its impact]
-            2. [Emerging opportunity and how to leverage it]
-            3. [Future prediction and preparation strategy]
+    POTENTIAL CHALLENGES AND SOLUTIONS:
+    Challenge 1: [Specific challenge]
+    Solution 1: [Detailed solution]
+    Challenge 2: [Specific challenge]
+    Solution 2: [Detailed solution]
 
-            REQUIRED SKILLS AND CERTIFICATIONS:
-            Technical Skills:
-            - [Key technical skill 1]
-            - [Key technical skill 2]
-            
-            Soft Skills:
-            - [Key soft skill 1]
-            - [Key soft skill 2]
-            
-            Recommended Certifications:
-            - [Relevant certification 1]
-            - [Relevant certification 2]
-            
-            IMPORTANT: Do not use any HTML formatting or tags (like <p>, <div>, etc.) in your response. Provide plain text only.
-            """
-        )
-        
-        self.role_analysis_prompt = PromptTemplate(
-            input_variables=["target_role", "industry"],
-            template="""
-            Analyze the following role and industry in detail:
-            
-            Target Role: {target_role}
-            Industry: {industry}
-            
-            Please provide a comprehensive analysis with the following sections (use bullet points for each section):
+    INDUSTRY TRENDS AND OPPORTUNITIES:
+    1. [Current trend and its impact]
+    2. [Emerging opportunity and how to leverage it]
+    3. [Future prediction and preparation strategy]
 
-            1. Role Overview and Responsibilities:
-            - [Detailed description of the role]
-            - [Key responsibilities and day-to-day tasks]
-            - [Where this role fits in organizational structure]
-            
-            2. Required Skills and Experience:
-            - [Technical skills needed] 
-            - [Soft skills required]
-            - [Required years of experience]
-            - [Educational requirements]
-            
-            3. Industry Outlook and Trends:
-            - [Current state of the industry]
-            - [Projected growth trajectory]
-            - [Key trends affecting this role]
-            
-            4. Salary Range and Growth Potential:
-            - [Entry-level salary range]
-            - [Mid-career salary expectations]
-            - [Senior-level compensation]
-            - [Career advancement paths]
-            
-            5. Key Companies and Organizations:
-            - [Top companies that hire for this role]
-            - [Industries where this role is in demand]
-            - [Notable employers to target]
+    REQUIRED SKILLS AND CERTIFICATIONS:
+    Technical Skills:
+    - [Key technical skill 1]
+    - [Key technical skill 2]
+    
+    Soft Skills:
+    - [Key soft skill 1]
+    - [Key soft skill 2]
+    
+    Recommended Certifications:
+    - [Relevant certification 1]
+    - [Relevant certification 2]
+    
+    IMPORTANT: Do not use any HTML formatting or tags (like <p>, <div>, etc.) in your response. Provide plain text only.
+    """
+
+_CAREER_PATH_PROMPT = """
+    CURRENT PROFILE:
+    - Role: {current_role}
+    - Experience: {experience}
+    - Skills: {skills}
+    - Interests: {interests}
+    - Career Goals: {goals}
+    """
+
+_ROLE_ANALYSIS_SYSTEM_PROMPT = """
+    Analyze the given role and industry in detail.
+    
+    Please provide a comprehensive analysis with the following sections (use bullet points for each section):
+
+    1. Role Overview and Responsibilities:
+    - [Detailed description of the role]
+    - [Key responsibilities and day-to-day tasks]
+    - [Where this role fits in organizational structure]
+    
+    2. Required Skills and Experience:
+    - [Technical skills needed] 
+    - [Soft skills required]
+    - [Required years of experience]
+    - [Educational requirements]
+    
+    3. Industry Outlook and Trends:
+    - [Current state of the industry]
+    - [Projected growth trajectory]
+    - [Key trends affecting this role]
+    
+    4. Salary Range and Growth Potential:
+    - [Entry-level salary range]
+    - [Mid-career salary expectations]
+    - [Senior-level compensation]
+    - [Career advancement paths]
+    
+    5. Key Companies and Organizations:
+    - [Top companies that hire for this role]
+    - [Industries where this role is in demand]
+    - [Notable employers to target]
+
+    Make your response detailed, practical, and specific to this exact role and industry.
+    """
+
+_ROLE_ANALYSIS_PROMPT = """
+    Target Role: {target_role}
+    Industry: {industry}
+    """
+
+_CAREER_PATH_SYSTEM_MESSAGE = SystemMessage(content=_CAREER_PATH_SYSTEM_PROMPT)
+_ROLE_ANALYSIS_SYSTEM_MESSAGE = SystemMessage(content=_ROLE_ANALYSIS_SYSTEM_PROMPT)
+
+# Bound ``str.format`` of the templates above, called directly on the hot paths
+_CAREER_PATH_FMT = _CAREER_PATH_PROMPT.format
+_ROLE_ANALYSIS_FMT = _ROLE_ANALYSIS_PROMPT.format
+
+@lru_cache(maxsize=128)
+def _format_profile(
+    current_role: str,
+    experience: str,
+    skills: Tuple[str, ...],
+    interests: Tuple[str, ...],
+    goals: Tuple[str, ...]
+) -> str:
+    """Format the career path user message once per distinct profile"""
+    return _CAREER_PATH_FMT(
+        current_role=current_role,
+        experience=experience,
+        skills=", ".join(skills),
+        interests=", ".join(interests),
+        goals=", ".join(goals)
+    )
+
+# Career path section headers mapped to the parsed_data key they fill
+_CAREER_PATH_HEADERS = {
+    "CAREER PATH OPTIONS:": "path_options",
+    "DEVELOPMENT TIMELINE:": "timeline",
+    "POTENTIAL CHALLENGES AND SOLUTIONS:": "challenges",
+    "INDUSTRY TRENDS AND OPPORTUNITIES:": "trends",
+    "REQUIRED SKILLS AND CERTIFICATIONS:": "required_skills",
+    "REQUIRED SKILLS:": "required_skills"
+}
+
+# All headers as one compiled alternation, used to find a header embedded in a
+# decorated line such as "1. CAREER PATH OPTIONS:" in a single scan
+_CAREER_PATH_HEADER_RE = re.compile("|".join(map(re.escape, _CAREER_PATH_HEADERS)))
+# Numbered list line ("1. ...", also "**1.** ..." with markdown emphasis)
+_NUMBERED_LINE_RE = re.compile(r"[*#\s]*\d")
+
+# Skills subsection headers (matched anywhere in the line, in this order)
+# mapped to the required_skills key they fill
+_SKILL_SUBSECTION_TERMS = (
+    ("Non-Technical:", "soft"),  # Before "Technical:", which it contains
+    ("Technical Skills:", "technical"), ("Technical:", "technical"),
+    ("Soft Skills:", "soft"), ("Soft:", "soft"),
+    ("Recommended Certifications:", "certifications"), ("Certifications:", "certifications"),
+    ("Certification:", "certifications"),
+)
+
+# Terms used to categorize skills when the response has no skill subsections
+# (matched on lowercased text)
+_CERTIFICATION_TERMS = ("degree", "certification", "certified", "certificate", "diploma")
+_SOFT_SKILL_TERMS = ("communication", "leadership", "teamwork", "problem-solving",
+                     "collaboration", "interpersonal", "time management")
+
+# Role analysis: numbered section headers ("2. Required Skills and Experience:")
+# and numbered list items
+_ROLE_SECTION_RE = re.compile(r'(\d+\.\s*[^:]+:)')
+_NUMBERED_RE = re.compile(r'^\d+\.')
+
+# Role analysis section classifiers: (term, section) pairs checked in order
+# against the lowercased header; the first term found decides the section
+_ROLE_SECTION_TERMS = (
+    ("overview", "overview"), ("responsibilities", "overview"),
+    ("skills", "requirements"), ("required", "requirements"), ("experience", "requirements"),
+    ("outlook", "outlook"), ("trends", "outlook"),
+    ("salary", "salary"), ("compensation", "salary"),
+    ("companies", "companies"), ("organizations", "companies"), ("employers", "companies"),
+)
+_ROLE_FALLBACK_SECTION_TERMS = (
+    ("role overview", "overview"), ("responsibilities", "overview"), ("1.", "overview"),
+    ("required skills", "requirements"), ("experience", "requirements"), ("2.", "requirements"),
+    ("industry outlook", "outlook"), ("trends", "outlook"), ("3.", "outlook"),
+    ("salary", "salary"), ("compensation", "salary"), ("4.", "salary"),
+    ("key companies", "companies"), ("organizations", "companies"), ("5.", "companies"),
+)
+_ROLE_HEADER_TERMS = ("overview", "skills", "outlook", "salary", "companies")
 
-            Make your response detailed, practical, and specific to this exact role and industry.
-            """
+class CareerNavigatorAgent(BaseAgent):
+    # Fields required by validate_input
+    _REQUIRED_FIELDS = frozenset({"current_role", "experience", "goals"})
+    
+    career_path_prompt = _CAREER_PATH_PROMPT
+    role_analysis_prompt = _ROLE_ANALYSIS_PROMPT
+    
+    def __init__(self, verbose: bool = False):
+        super().__init__(
+            role="Career Navigator",
+            goal="Create personalized career paths and progression strategies",
+            backstory="Expert in career planning and professional development",
+            verbose=verbose
         )
     
     def create_career_path(
@@ -127,47 +230,64 @@ class CareerNavigatorAgent(BaseAgent):
             Dict: Career path recommendations and analysis
         """
         try:
-            # Format inputs
-            skills_text = ", ".join(skills)
-            interests_text = ", ".join(interests)
-            goals_text = ", ".join(goals)
+            # Equivalent profiles (case, whitespace, list order) reuse the parsed plan
+            cache_key = self._career_path_cache_key(current_role, experience, skills, interests, goals)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self._log("Serving career path from cache")
+                return copy.deepcopy(cached)
             
-            # Get career path analysis
-            response = self.llm.invoke(
-                self.career_path_prompt.format(
-                    current_role=current_role,
-                    experience=experience,
-                    skills=skills_text,
-                    interests=interests_text,
-                    goals=goals_text
-                )
-            ).content
+            prompt = self._format_career_path_prompt(current_role, experience, skills, interests, goals)
             
-            # Debug log
-            self._log(f"Raw career path response (first 200 chars): {response[:200]}...")
+            # Ask for the plan as structured data; parse a text answer only as a fallback
+            result = self._structured_invoke(prompt, CareerPathResponse)
+            if result is not None:
+                career_path = self._build_career_path(current_role, result.model_dump_json(), result.model_dump())
+            else:
+                # Get career path analysis, parsing lines as they are streamed
+                chunks = []
+                parsed_data = self._parse_career_path_lines(self._stream_lines(prompt, chunks))
+                career_path = self._build_career_path(current_role, "".join(chunks), parsed_data)
             
-            # Parse and structure the response
-            parsed_data = self._parse_career_path(response)
+            self._cache_put(cache_key, copy.deepcopy(career_path))
+            return career_path
             
-            # Validate parsed data
-            if not any(parsed_data["path_options"]):
-                self._log("Warning: No career path options found in response")
-            if not any(parsed_data["timeline"]):
-                self._log("Warning: No timeline entries found in response")
-            if not any(parsed_data["trends"]):
-                self._log("Warning: No industry trends found in response")
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    async def acreate_career_path(
+        self,
+        current_role: str,
+        experience: str,
+        skills: List[str],
+        interests: List[str],
+        goals: List[str]
+    ) -> Dict:
+        """
+        Async variant of create_career_path.
+        
+        Lets callers overlap it with other LLM calls, e.g.
+        ``await asyncio.gather(navigator.acreate_career_path(...), navigator.aanalyze_role(...))``.
+        """
+        try:
+            cache_key = self._career_path_cache_key(current_role, experience, skills, interests, goals)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self._log("Serving career path from cache")
+                return copy.deepcopy(cached)
             
-            # Log skills data for debugging
-            self._log(f"Technical skills found: {len(parsed_data['required_skills']['technical'])}")
-            self._log(f"Soft skills found: {len(parsed_data['required_skills']['soft'])}")
-            self._log(f"Certifications found: {len(parsed_data['required_skills']['certifications'])}")
+            prompt = self._format_career_path_prompt(current_role, experience, skills, interests, goals)
             
-            career_path = {
-                "raw_analysis": response,
-                "structured_data": parsed_data
-            }
+            result = await self._astructured_invoke(prompt, CareerPathResponse)
+            if result is not None:
+                career_path = self._build_career_path(current_role, result.model_dump_json(), result.model_dump())
+            else:
+                response = (await self.llm.ainvoke(prompt)).content
+                career_path = self._build_career_path(current_role, response)
             
-            self._log(f"Created career path plan for {current_role}")
+            self._cache_put(cache_key, copy.deepcopy(career_path))
             return career_path
             
         except Exception as e:
@@ -175,6 +295,84 @@ class CareerNavigatorAgent(BaseAgent):
             self._log(error_msg)
             raise ValueError(error_msg)
     
+    def _career_path_cache_key(
+        self,
+        current_role: str,
+        experience: str,
+        skills: List[str],
+        interests: List[str],
+        goals: List[str]
+    ) -> tuple:
+        """Cache key for a profile, ignoring case, whitespace and list order"""
+        return (
+            ("create_career_path",)
+            + self._normalize_key(current_role, experience)
+            + tuple(tuple(sorted(set(self._normalize_key(*items)))) for items in (skills, interests, goals))
+        )
+    
+    def _format_career_path_prompt(
+        self,
+        current_role: str,
+        experience: str,
+        skills: List[str],
+        interests: List[str],
+        goals: List[str]
+    ) -> List[BaseMessage]:
+        """Build the career path messages (static instructions, then the user profile)"""
+        return [
+            _CAREER_PATH_SYSTEM_MESSAGE,
+            HumanMessage(content=_format_profile(
+                current_role, experience, tuple(skills), tuple(interests), tuple(goals)
+            ))
+        ]
+    
+    @staticmethod
+    def _role_analysis_messages(target_role: str, industry: str) -> List[BaseMessage]:
+        """Build the role analysis messages (static instructions, then the role)"""
+        return [
+            _ROLE_ANALYSIS_SYSTEM_MESSAGE,
+            HumanMessage(content=_ROLE_ANALYSIS_FMT(target_role=target_role, industry=industry))
+        ]
+    
+    def _build_career_path(
+        self,
+        current_role: str,
+        response: str,
+        parsed_data: Optional[Dict] = None
+    ) -> Dict:
+        """Structure a career path response, parsing the raw text unless parsed_data is given"""
+        # Debug log
+        if self.verbose:
+            self._log(f"Raw career path response (first 200 chars): {response[:200]}...")
+        
+        # Parse and structure the response
+        if parsed_data is None:
+            parsed_data = self._parse_career_path(response)
+        else:
+            self._fill_career_path_defaults(parsed_data)
+        
+        # Validate parsed data
+        if not any(parsed_data["path_options"]):
+            self._log("Warning: No career path options found in response")
+        if not any(parsed_data["timeline"]):
+            self._log("Warning: No timeline entries found in response")
+        if not any(parsed_data["trends"]):
+            self._log("Warning: No industry trends found in response")
+        
+        # Log skills data for debugging
+        if self.verbose:
+            self._log(f"Technical skills found: {len(parsed_data['required_skills']['technical'])}")
+            self._log(f"Soft skills found: {len(parsed_data['required_skills']['soft'])}")
+            self._log(f"Certifications found: {len(parsed_data['required_skills']['certifications'])}")
+        
+        career_path = {
+            "raw_analysis": response,
+            "structured_data": parsed_data
+        }
+        
+        self._log(f"Created career path plan for {current_role}")
+        return career_path
+    
     def analyze_role(self, target_role: str, industry: str) -> Dict:
         """
         Analyze a specific role and industry
@@ -187,37 +385,126 @@ class CareerNavigatorAgent(BaseAgent):
             Dict: Role analysis and insights
         """
         try:
-            # Get role analysis from LLM using invoke instead of predict
-            response = self.llm.invoke(
-                self.role_analysis_prompt.format(
-                    target_role=target_role,
-                    industry=industry
-                )
-            ).content
+            # Get role analysis from LLM, reusing earlier answers for the same role/industry
+            response = self._cached_invoke(
+                self._role_analysis_messages(target_role, industry),
+                cache_key=("analyze_role",) + self._normalize_key(target_role, industry),
+                llm=self.fast_llm
+            )
             
-            # Log the raw response for debugging
-            self._log(f"Raw role analysis response for {target_role} (first 200 chars): {response[:200]}...")
+            return self._build_role_analysis(target_role, industry, response)
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    async def aanalyze_role(self, target_role: str, industry: str) -> Dict:
+        """Async variant of analyze_role; see acreate_career_path for concurrent use"""
+        try:
+            response = await self._acached_invoke(
+                self._role_analysis_messages(target_role, industry),
+                cache_key=("analyze_role",) + self._normalize_key(target_role, industry),
+                llm=self.fast_llm
+            )
+            
+            return self._build_role_analysis(target_role, industry, response)
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    def analyze_roles(self, target_roles: List[str], industry: str) -> Dict[str, Dict]:
+        """
+        Analyze several roles in the same industry with one batched LLM call
+        
+        Args:
+            target_roles (List[str]): Roles to analyze
+            industry (str): Industry context
             
-            # Parse and structure the response
-            analysis = {
-                "raw_analysis": response,
-                "structured_data": self._parse_role_analysis(response)
+        Returns:
+            Dict[str, Dict]: Role analysis and insights keyed by role
+        """
+        try:
+            responses = self._batch_invoke(
+                [
+                    self._role_analysis_messages(target_role, industry)
+                    for target_role in target_roles
+                ],
+                cache_keys=[
+                    ("analyze_role",) + self._normalize_key(target_role, industry)
+                    for target_role in target_roles
+                ],
+                llm=self.fast_llm
+            )
+            
+            return {
+                target_role: self._build_role_analysis(target_role, industry, response)
+                for target_role, response in zip(target_roles, responses)
             }
             
-            # Validate the structure
-            for key, value in analysis["structured_data"].items():
-                self._log(f"Section '{key}' has {len(value)} items")
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    async def aanalyze_roles(self, target_roles: List[str], industry: str) -> Dict[str, Dict]:
+        """Async variant of analyze_roles; requests run concurrently up to Config.LLM_MAX_CONCURRENCY"""
+        try:
+            responses = await self._abatch_invoke(
+                [
+                    self._role_analysis_messages(target_role, industry)
+                    for target_role in target_roles
+                ],
+                cache_keys=[
+                    ("analyze_role",) + self._normalize_key(target_role, industry)
+                    for target_role in target_roles
+                ],
+                llm=self.fast_llm
+            )
             
-            self._log(f"Completed analysis for {target_role} in {industry}")
-            return analysis
+            return {
+                target_role: self._build_role_analysis(target_role, industry, response)
+                for target_role, response in zip(target_roles, responses)
+            }
             
         except Exception as e:
             error_msg = self._format_error(e)
             self._log(error_msg)
             raise ValueError(error_msg)
     
+    def _build_role_analysis(self, target_role: str, industry: str, response: str) -> Dict:
+        """Structure a raw role analysis response"""
+        # Log the raw response for debugging
+        if self.verbose:
+            self._log(f"Raw role analysis response for {target_role} (first 200 chars): {response[:200]}...")
+        
+        # Parse and structure the response
+        analysis = {
+            "raw_analysis": response,
+            "structured_data": self._cached_parse(self._parse_role_analysis, response)
+        }
+        
+        # Validate the structure
+        if self.verbose:
+            for key, value in analysis["structured_data"].items():
+                self._log(f"Section '{key}' has {len(value)} items")
+        
+        self._log(f"Completed analysis for {target_role} in {industry}")
+        return analysis
+    
     def _parse_career_path(self, response: str) -> Dict:
         """Parse the career path response with improved section detection"""
+        return self._parse_career_path_lines(response.splitlines())
+    
+    def _parse_career_path_lines(self, lines: Iterable[str]) -> Dict:
+        """
+        Parse career path response lines.
+        
+        Lines are consumed one at a time, so ``lines`` may be a generator fed
+        from a streaming LLM response (see BaseAgent._stream_lines).
+        """
         parsed_data = {
             "path_options": [],
             "timeline": [],
@@ -231,107 +518,101 @@ class CareerNavigatorAgent(BaseAgent):
             }
         }
         
-        # Split into major sections first
-        sections = response.split("\n\n")
+        # Single pass over the lines; the current header decides how a line is read
         current_section = None
-        current_skill_type = None
+        challenge = None
+        current_type = None
+        has_subsections = False
+        skill_lines = []  # (subsection type, skill) pairs of the skills section
         
-        for section in sections:
-            section = section.strip()
-            if not section:
+        for line in lines:
+            line = line.strip()
+            if not line:
                 continue
             
             # Identify major sections
-            if "CAREER PATH OPTIONS:" in section:
-                lines = section.split("\n")[1:]  # Skip the header
-                for line in lines:
-                    if line.strip() and any(c.isdigit() for c in line):
-                        path = line.split(".", 1)[1].strip() if "." in line else line.strip()
-                        if path:
-                            parsed_data["path_options"].append(path)
+            header = _CAREER_PATH_HEADERS.get(line.strip("*# "))
+            if not header and line.isupper():
+                match = _CAREER_PATH_HEADER_RE.search(line)
+                header = match and _CAREER_PATH_HEADERS[match.group(0)]
+            if header:
+                current_section = header
+                challenge = None
+                if header == "required_skills":
+                    self._log("Found skills section, parsing...")
+                continue
             
-            elif "DEVELOPMENT TIMELINE:" in section:
-                lines = section.split("\n")[1:]  # Skip the header
-                for line in lines:
-                    if line.strip().startswith("-"):
-                        timeline_item = line.strip("- ").strip()
-                        if timeline_item:
-                            parsed_data["timeline"].append(timeline_item)
+            if current_section == "path_options" or current_section == "trends":
+                if _NUMBERED_LINE_RE.match(line):
+                    _, sep, rest = line.partition(".")
+                    item = rest.strip() if sep else line
+                    if item:
+                        parsed_data[current_section].append(item)
             
-            elif "POTENTIAL CHALLENGES AND SOLUTIONS:" in section:
-                lines = section.split("\n")[1:]  # Skip the header
-                challenge = None
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith("Challenge"):
-                        challenge = line.split(":", 1)[1].strip() if ":" in line else line.strip()
-                        if challenge:
-                            parsed_data["challenges"].append(challenge)
-                    elif line.startswith("Solution") and challenge:
-                        solution = line.split(":", 1)[1].strip() if ":" in line else line.strip()
-                        if solution:
-                            parsed_data["solutions"].append(solution)
+            elif current_section == "timeline":
+                if line.startswith("-"):
+                    timeline_item = line.strip("- ").strip()
+                    if timeline_item:
+                        parsed_data["timeline"].append(timeline_item)
             
-            elif "INDUSTRY TRENDS AND OPPORTUNITIES:" in section:
-                lines = section.split("\n")[1:]  # Skip the header
-                for line in lines:
-                    if line.strip() and any(c.isdigit() for c in line):
-                        trend = line.split(".", 1)[1].strip() if "." in line else line.strip()
-                        if trend:
-                            parsed_data["trends"].append(trend)
+            elif current_section == "challenges":
+                if line.startswith("Challenge"):
+                    _, sep, rest = line.partition(":")
+                    challenge = rest.strip() if sep else line
+                    if challenge:
+                        parsed_data["challenges"].append(challenge)
+                elif line.startswith("Solution") and challenge:
+                    _, sep, rest = line.partition(":")
+                    solution = rest.strip() if sep else line
+                    if solution:
+                        parsed_data["solutions"].append(solution)
             
-            elif "REQUIRED SKILLS AND CERTIFICATIONS:" in section or "REQUIRED SKILLS:" in section:
-                self._log("Found skills section, parsing...")
-                lines = section.split("\n")[1:]  # Skip the header
-                current_type = None
-                
-                # Check if this section has subsections
-                has_subsections = any("Technical Skills:" in line or "Soft Skills:" in line or 
-                                     "Technical:" in line or "Soft:" in line or
-                                     "Certifications:" in line for line in lines)
-                
-                if has_subsections:
-                    for line in lines:
-                        line = line.strip()
-                        # Identify subsection types with more flexible matching
-                        if any(term in line for term in ["Technical Skills:", "Technical:"]):
-                            current_type = "technical"
-                            self._log("Found technical skills subsection")
-                        elif any(term in line for term in ["Soft Skills:", "Soft:", "Non-Technical:"]):
-                            current_type = "soft"
-                            self._log("Found soft skills subsection")
-                        elif any(term in line for term in ["Recommended Certifications:", "Certifications:", "Certification:"]):
-                            current_type = "certifications"
-                            self._log("Found certifications subsection")
-                        # Extract skills from bullet points
-                        elif line.startswith("-") or line.startswith("•") or line.startswith("*"):
-                            skill = line.strip("- •*").strip()
-                            if skill and current_type:
-                                parsed_data["required_skills"][current_type].append(skill)
-                                self._log(f"Added {current_type} skill: {skill}")
+            elif current_section == "required_skills":
+                # Identify subsection types with more flexible matching
+                subsection = next(
+                    (skill_type for term, skill_type in _SKILL_SUBSECTION_TERMS if term in line),
+                    None
+                )
+                if subsection:
+                    current_type = subsection
+                    has_subsections = True
+                    self._log(f"Found {subsection} skills subsection")
+                # Extract skills from bullet points
+                elif line.startswith(("-", "•", "*")):
+                    skill = line.strip("- •*").strip()
+                    if skill:
+                        skill_lines.append((current_type, skill))
+        
+        # Per-skill debug logs are guarded so their f-strings are skipped when not verbose
+        if has_subsections:
+            for skill_type, skill in skill_lines:
+                if skill_type:
+                    parsed_data["required_skills"][skill_type].append(skill)
+                    if self.verbose:
+                        self._log(f"Added {skill_type} skill: {skill}")
+        elif skill_lines:
+            # If there are no clear subsections, try to categorize skills by keywords
+            self._log("No clear skill subsections, attempting to categorize by keywords")
+            for _, skill in skill_lines:
+                # Attempt to categorize by keywords
+                skill_lower = skill.lower()
+                if any(term in skill_lower for term in _CERTIFICATION_TERMS):
+                    skill_type = "certifications"
+                elif any(term in skill_lower for term in _SOFT_SKILL_TERMS):
+                    skill_type = "soft"
                 else:
-                    # If there are no clear subsections, try to categorize skills by keywords
-                    self._log("No clear skill subsections, attempting to categorize by keywords")
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith("-") or line.startswith("•") or line.startswith("*"):
-                            skill = line.strip("- •*").strip()
-                            if not skill:
-                                continue
-                                
-                            # Attempt to categorize by keywords
-                            if any(term in skill.lower() for term in ["degree", "certification", "certified", "certificate", "diploma"]):
-                                parsed_data["required_skills"]["certifications"].append(skill)
-                                self._log(f"Categorized as certification: {skill}")
-                            elif any(term in skill.lower() for term in ["communication", "leadership", "teamwork", "problem-solving", 
-                                                                      "collaboration", "interpersonal", "time management"]):
-                                parsed_data["required_skills"]["soft"].append(skill)
-                                self._log(f"Categorized as soft skill: {skill}")
-                            else:
-                                # Default to technical
-                                parsed_data["required_skills"]["technical"].append(skill)
-                                self._log(f"Categorized as technical skill: {skill}")
+                    # Default to technical
+                    skill_type = "technical"
+                parsed_data["required_skills"][skill_type].append(skill)
+                if self.verbose:
+                    self._log(f"Categorized as {skill_type}: {skill}")
+        
+        self._fill_career_path_defaults(parsed_data)
         
+        return parsed_data
+    
+    def _fill_career_path_defaults(self, parsed_data: Dict) -> None:
+        """Pair up challenges with solutions and fill empty sections with defaults"""
         # Ensure we have matching challenges and solutions
         if len(parsed_data["challenges"]) > len(parsed_data["solutions"]):
             parsed_data["challenges"] = parsed_data["challenges"][:len(parsed_data["solutions"])]
@@ -349,15 +630,31 @@ class CareerNavigatorAgent(BaseAgent):
         if not parsed_data["trends"]:
             parsed_data["trends"] = ["Industry trend information not available"]
             
-        # Add default values for skills sections if they're empty
-        if not parsed_data["required_skills"]["technical"]:
-            parsed_data["required_skills"]["technical"] = ["Technical skills information not available"]
-        if not parsed_data["required_skills"]["soft"]:
-            parsed_data["required_skills"]["soft"] = ["Soft skills information not available"]
-        if not parsed_data["required_skills"]["certifications"]:
-            parsed_data["required_skills"]["certifications"] = ["Certification information not available"]
-        
-        return parsed_data
+        self._fill_skill_defaults(parsed_data["required_skills"])
+    
+    @staticmethod
+    def _fill_skill_defaults(required_skills: Dict) -> None:
+        """Add default values for skills sections if they're empty"""
+        if not required_skills["technical"]:
+            required_skills["technical"] = ["Technical skills information not available"]
+        if not required_skills["soft"]:
+            required_skills["soft"] = ["Soft skills information not available"]
+        if not required_skills["certifications"]:
+            required_skills["certifications"] = ["Certification information not available"]
+    
+    @staticmethod
+    def _role_analysis_item(line: str, skip_links: bool = False) -> Optional[str]:
+        """Return the list item text of a stripped role analysis line, or None to skip it"""
+        # If line starts with bullet point or dash
+        if line.startswith(('-', '•')):
+            return line[1:].strip()
+        # If line starts with number and period
+        if _NUMBERED_RE.match(line):
+            return _NUMBERED_RE.sub('', line, count=1).strip()
+        # If it's a substantial line, include it even without bullet point
+        if len(line) > 10 and not (skip_links and line.startswith('http')):
+            return line
+        return None
     
     def _parse_role_analysis(self, response: str) -> Dict:
         """Parse the role analysis response"""
@@ -370,8 +667,7 @@ class CareerNavigatorAgent(BaseAgent):
         }
         
         # First try to split by numbered sections
-        section_pattern = r'(\d+\.\s*[^:]+:)'
-        sections = re.split(section_pattern, response)
+        sections = _ROLE_SECTION_RE.split(response)
         
         # If we have well-formatted numbered sections
         if len(sections) > 1:
@@ -383,36 +679,19 @@ class CareerNavigatorAgent(BaseAgent):
                     continue
                 
                 # Check if this is a section header
-                if re.match(r'^\d+\.\s*', section):
+                if _NUMBERED_RE.match(section):
                     section_lower = section.lower()
-                    if 'overview' in section_lower or 'responsibilities' in section_lower:
-                        current_section = "overview"
-                    elif 'skills' in section_lower or 'required' in section_lower or 'experience' in section_lower:
-                        current_section = "requirements"
-                    elif 'outlook' in section_lower or 'trends' in section_lower:
-                        current_section = "outlook"
-                    elif 'salary' in section_lower or 'compensation' in section_lower:
-                        current_section = "salary"
-                    elif 'companies' in section_lower or 'organizations' in section_lower or 'employers' in section_lower:
-                        current_section = "companies"
+                    current_section = next(
+                        (name for term, name in _ROLE_SECTION_TERMS if term in section_lower),
+                        current_section
+                    )
                 elif current_section and i < len(sections) - 1:
                     # This is the content of a section
                     lines = [line.strip() for line in section.split('\n') if line.strip()]
                     # Extract items that look like bullet points
-                    for line in lines:
-                        # If line starts with bullet point or dash
-                        if line.startswith('-') or line.startswith('•'):
-                            item = line[1:].strip()
-                            if item:
-                                parsed_data[current_section].append(item)
-                        # If line starts with number and period
-                        elif re.match(r'^\d+\.', line):
-                            item = re.sub(r'^\d+\.', '', line).strip()
-                            if item:
-                                parsed_data[current_section].append(item)
-                        # If it's a substantial line, include it even without bullet point
-                        elif len(line) > 10 and not line.startswith('http'):
-                            parsed_data[current_section].append(line)
+                    parsed_data[current_section].extend(
+                        filter(None, (self._role_analysis_item(line, skip_links=True) for line in lines))
+                    )
         
         # If the above parsing method didn't work, try the simpler approach
         if not any(len(items) for items in parsed_data.values()):
@@ -424,36 +703,21 @@ class CareerNavigatorAgent(BaseAgent):
                     continue
                 
                 section_lower = section.lower()
-                if any(term in section_lower for term in ["role overview", "responsibilities", "1."]):
-                    current_section = "overview"
-                elif any(term in section_lower for term in ["required skills", "experience", "2."]):
-                    current_section = "requirements"
-                elif any(term in section_lower for term in ["industry outlook", "trends", "3."]):
-                    current_section = "outlook"
-                elif any(term in section_lower for term in ["salary", "compensation", "4."]):
-                    current_section = "salary"
-                elif any(term in section_lower for term in ["key companies", "organizations", "5."]):
-                    current_section = "companies"
+                current_section = next(
+                    (name for term, name in _ROLE_FALLBACK_SECTION_TERMS if term in section_lower),
+                    current_section
+                )
                 
                 if current_section:
                     lines = [line.strip() for line in section.split('\n') if line.strip()]
                     # Skip the first line if it's likely a section header
                     start_idx = 1 if len(lines) > 1 and any(term in lines[0].lower() 
-                                                          for term in ["overview", "skills", "outlook", "salary", "companies"]) else 0
+                                                          for term in _ROLE_HEADER_TERMS) else 0
                     
-                    for line in lines[start_idx:]:
-                        # Process bullet points and numbered items
-                        if line.startswith('-') or line.startswith('•'):
-                            item = line[1:].strip()
-                            if item:
-                                parsed_data[current_section].append(item)
-                        elif re.match(r'^\d+\.', line):
-                            item = re.sub(r'^\d+\.', '', line).strip()
-                            if item:
-                                parsed_data[current_section].append(item)
-                        # Include substantial non-bullet lines as well
-                        elif len(line) > 10:
-                            parsed_data[current_section].append(line)
+                    # Process bullet points and numbered items
+                    parsed_data[current_section].extend(
+                        filter(None, (self._role_analysis_item(line) for line in lines[start_idx:]))
+                    )
         
         # Add default values if sections are empty
         if not parsed_data["overview"]:
@@ -468,7 +732,3 @@ class CareerNavigatorAgent(BaseAgent):
             parsed_data["companies"] = ["Key companies information not available. Please try with a more specific industry."]
         
         return parsed_data
-    
-    def get_required_fields(self) -> List[str]:
-        """Get required fields for career navigation"""
-        return ["current_role", "experience", "goals"] 
\ No newline at end of file
@@ -1,9 +1,88 @@
-from typing import Dict, List, Any, Optional
+import copy
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from .base_agent import BaseAgent
-from langchain.prompts import PromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
 import re
 
+class NetworkingStrategyResponse(BaseModel):
+    """Structured networking strategy"""
+    target_connections: List[str] = Field(default_factory=list, description="Types of professionals to connect with")
+    platforms: List[str] = Field(default_factory=list, description="Networking platforms and events")
+    outreach_templates: List[str] = Field(default_factory=list, description="Connection request, follow-up and informational interview templates")
+    engagement_strategy: List[str] = Field(default_factory=list, description="Content sharing, commenting and group participation")
+    in_person_tactics: List[str] = Field(default_factory=list, description="In-person networking tactics")
+    relationship_nurturing: List[str] = Field(default_factory=list, description="Ways to maintain and strengthen connections")
+    metrics: List[str] = Field(default_factory=list, description="Metrics to track")
+    action_plan: List[str] = Field(default_factory=list, description="Weekly networking action plan")
+
+# Static instructions go in the system message and the per-request details in
+# the user message, so every request shares a provider-cacheable prompt prefix.
+_NETWORKING_SYSTEM_PROMPT = """Create a networking strategy specific to the user's industry, career stage and goals, in these numbered sections:
+1. Target Connections (types of professionals to connect with)
+2. Networking Platforms (LinkedIn, industry-specific platforms, events)
+3. Outreach Templates (connection requests, follow-ups, informational interviews)
+4. Engagement Strategy (content sharing, commenting, group participation)
+5. In-Person Networking Tactics (events, conferences, meetups)
+6. Relationship Nurturing (maintaining and strengthening connections)
+7. Metrics to Track (connection growth, engagement rates, opportunities generated)
+8. Weekly Networking Action Plan"""
+
+_NETWORKING_PROMPT = """Career Stage: {career_stage}
+Industry: {industry}
+
+Networking Goals:
+{goals}
+
+Current Network Description:
+{current_network}"""
+
+_NETWORKING_SYSTEM_MESSAGE = SystemMessage(content=_NETWORKING_SYSTEM_PROMPT)
+
+# Bound ``str.format`` of the template above, called directly on the hot path
+_NETWORKING_FMT = _NETWORKING_PROMPT.format
+
+@lru_cache(maxsize=128)
+def _format_networking_request(
+    career_stage: str,
+    industry: str,
+    goals: Tuple[str, ...],
+    current_network: str
+) -> str:
+    """Format the networking strategy user message once per distinct request"""
+    return _NETWORKING_FMT(
+        career_stage=career_stage,
+        industry=industry,
+        goals="\n".join([f"- {goal}" for goal in goals]),
+        current_network=current_network
+    )
+
+# Networking strategy section titles (lowercased) mapped to strategy_data keys
+_NETWORKING_SECTIONS = {
+    "target connections": "target_connections",
+    "networking platforms": "platforms",
+    "outreach templates": "outreach_templates",
+    "engagement strategy": "engagement_strategy",
+    "in-person networking": "in_person_tactics",
+    "relationship nurturing": "relationship_nurturing",
+    "metrics to track": "metrics",
+    "weekly networking": "action_plan"
+}
+
+# Numbered strategy sections ("3. Outreach Templates"), only at the start of a
+# line so inline text such as "Step 1. Do X" does not split a section
+_NETWORKING_SECTION_RE = re.compile(r'^\s*\d+\.\s+', re.MULTILINE)
+
+# Numbered list item prefix of a stripped line
+_NUMBERED_ITEM_RE = re.compile(r'\d+\.\s+')
+
 class CommunicationAgent(BaseAgent):
+    # Fields required by validate_input
+    _REQUIRED_FIELDS = frozenset({"career_stage", "industry", "goals"})
+    
+    networking_prompt = _NETWORKING_PROMPT
+    
     def __init__(self, verbose: bool = False):
         super().__init__(
             role="Communication Expert",
@@ -11,39 +90,7 @@ class CommunicationAgent(BaseAgent):
             backstory="Specialist in professional networking strategies for career advancement",
             verbose=verbose
         )
-        
-        # Networking strategy prompt
-        self.networking_prompt = PromptTemplate(
-            input_variables=["career_stage", "industry", "goals", "current_network"],
-            template="""
-            Create a personalized networking strategy based on the following information:
-            
-            Career Stage:
-            {career_stage}
-            
-            Industry:
-            {industry}
-            
-            Networking Goals:
-            {goals}
-            
-            Current Network Description:
-            {current_network}
             
-            Please provide a comprehensive networking strategy including:
-            1. Target Connections (types of professionals to connect with)
-            2. Networking Platforms (LinkedIn, industry-specific platforms, events)
-            3. Outreach Templates (connection requests, follow-ups, informational interviews)
-            4. Engagement Strategy (content sharing, commenting, group participation)
-            5. In-Person Networking Tactics (events, conferences, meetups)
-            6. Relationship Nurturing (maintaining and strengthening connections)
-            7. Metrics to Track (connection growth, engagement rates, opportunities generated)
-            8. Weekly Networking Action Plan
-            
-            Make all recommendations specific to the industry, career stage, and goals.
-            """
-        )
-    
     def create_networking_strategy(
         self,
         career_stage: str,
@@ -64,26 +111,71 @@ class CommunicationAgent(BaseAgent):
             Dict: Personalized networking strategy
         """
         try:
-            # Format goals
-            goals_text = "\n".join([f"- {goal}" for goal in goals])
+            # Equivalent requests reuse the structured strategy
+            cache_key = ("structured",) + self._networking_cache_key(career_stage, industry, goals, current_network)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self._log("Serving networking strategy from cache")
+                return copy.deepcopy(cached)
             
-            # Get networking strategy from LLM
-            response = self.llm.invoke(
-                self.networking_prompt.format(
-                    career_stage=career_stage,
-                    industry=industry,
-                    goals=goals_text,
-                    current_network=current_network
+            messages = self._networking_messages(career_stage, industry, goals, current_network)
+            
+            # Ask for the strategy as structured data; parse a text answer only as a fallback
+            result = self._structured_invoke(messages, NetworkingStrategyResponse)
+            if result is not None:
+                strategy = self._build_networking_strategy(
+                    career_stage, industry, result.model_dump_json(), result.model_dump()
+                )
+            else:
+                response = self._cached_invoke(
+                    messages,
+                    cache_key=self._networking_cache_key(career_stage, industry, goals, current_network)
                 )
-            ).content
+                strategy = self._build_networking_strategy(career_stage, industry, response)
+            
+            self._cache_put(cache_key, copy.deepcopy(strategy))
+            return strategy
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    async def acreate_networking_strategy(
+        self,
+        career_stage: str,
+        industry: str,
+        goals: List[str],
+        current_network: str
+    ) -> Dict:
+        """
+        Async variant of create_networking_strategy.
+        
+        Strategies for several industries can run concurrently, e.g. with
+        ``asyncio.gather(*(agent.acreate_networking_strategy(stage, industry, goals, network) for industry in industries))``.
+        """
+        try:
+            cache_key = ("structured",) + self._networking_cache_key(career_stage, industry, goals, current_network)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                self._log("Serving networking strategy from cache")
+                return copy.deepcopy(cached)
+            
+            messages = self._networking_messages(career_stage, industry, goals, current_network)
             
-            # Parse and structure the response
-            strategy = {
-                "raw_strategy": response,
-                "structured_data": self._parse_networking_strategy(response)
-            }
+            result = await self._astructured_invoke(messages, NetworkingStrategyResponse)
+            if result is not None:
+                strategy = self._build_networking_strategy(
+                    career_stage, industry, result.model_dump_json(), result.model_dump()
+                )
+            else:
+                response = await self._acached_invoke(
+                    messages,
+                    cache_key=self._networking_cache_key(career_stage, industry, goals, current_network)
+                )
+                strategy = self._build_networking_strategy(career_stage, industry, response)
             
-            self._log(f"Created networking strategy for {career_stage} professional in {industry}")
+            self._cache_put(cache_key, copy.deepcopy(strategy))
             return strategy
             
         except Exception as e:
@@ -91,6 +183,115 @@ class CommunicationAgent(BaseAgent):
             self._log(error_msg)
             raise ValueError(error_msg)
     
+    def create_networking_strategies(
+        self,
+        career_stage: str,
+        industries: List[str],
+        goals: List[str],
+        current_network: str
+    ) -> Dict[str, Dict]:
+        """
+        Create networking strategies for several industries with one batched LLM call
+        
+        Args:
+            career_stage (str): User's current career stage
+            industries (List[str]): Industries to plan for
+            goals (List[str]): User's networking goals
+            current_network (str): Description of user's current network
+            
+        Returns:
+            Dict[str, Dict]: Networking strategy keyed by industry
+        """
+        try:
+            # Strategies already created (by either entry point) are served from the
+            # same structured cache create_networking_strategy uses; only the rest are batched
+            strategies = {}
+            pending = []
+            for industry in industries:
+                cache_key = ("structured",) + self._networking_cache_key(career_stage, industry, goals, current_network)
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    strategies[industry] = copy.deepcopy(cached)
+                elif industry not in pending:
+                    pending.append(industry)
+            
+            if pending:
+                responses = self._batch_invoke(
+                    [
+                        self._networking_messages(career_stage, industry, goals, current_network)
+                        for industry in pending
+                    ],
+                    cache_keys=[
+                        self._networking_cache_key(career_stage, industry, goals, current_network)
+                        for industry in pending
+                    ]
+                )
+                
+                for industry, response in zip(pending, responses):
+                    strategy = self._build_networking_strategy(career_stage, industry, response)
+                    self._cache_put(
+                        ("structured",) + self._networking_cache_key(career_stage, industry, goals, current_network),
+                        copy.deepcopy(strategy)
+                    )
+                    strategies[industry] = strategy
+            
+            return {industry: strategies[industry] for industry in industries}
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    def _networking_cache_key(
+        self,
+        career_stage: str,
+        industry: str,
+        goals: List[str],
+        current_network: str
+    ) -> tuple:
+        """Response cache key for a networking strategy request"""
+        return (
+            ("create_networking_strategy",)
+            + self._normalize_key(career_stage, industry, current_network)
+            + (self._normalize_key(*goals),)
+        )
+    
+    @staticmethod
+    def _networking_messages(
+        career_stage: str,
+        industry: str,
+        goals: List[str],
+        current_network: str
+    ) -> List[BaseMessage]:
+        """Build the networking strategy messages (static instructions, then the user's details)"""
+        return [
+            _NETWORKING_SYSTEM_MESSAGE,
+            HumanMessage(content=_format_networking_request(
+                career_stage, industry, tuple(goals), current_network
+            ))
+        ]
+    
+    def _build_networking_strategy(
+        self,
+        career_stage: str,
+        industry: str,
+        response: str,
+        parsed_data: Optional[Dict] = None
+    ) -> Dict:
+        """Structure a networking strategy response, parsing it unless already structured"""
+        if parsed_data is None:
+            parsed_data = self._cached_parse(self._parse_networking_strategy, response)
+        else:
+            self._fill_strategy_defaults(parsed_data)
+        
+        strategy = {
+            "raw_strategy": response,
+            "structured_data": parsed_data
+        }
+        
+        self._log(f"Created networking strategy for {career_stage} professional in {industry}")
+        return strategy
+    
     def _parse_networking_strategy(self, response: str) -> Dict:
         """Parse networking strategy response"""
         strategy_data = {
@@ -105,47 +306,37 @@ class CommunicationAgent(BaseAgent):
         }
         
         # Split into sections and extract content
-        sections = re.split(r'\d+\.\s+', response)
+        sections = _NETWORKING_SECTION_RE.split(response)
         
         # The first element is usually empty after splitting
         if sections and not sections[0].strip():
             sections = sections[1:]
         
-        # Map sections to data structure
-        section_mapping = {
-            "target connections": "target_connections",
-            "networking platforms": "platforms",
-            "outreach templates": "outreach_templates",
-            "engagement strategy": "engagement_strategy",
-            "in-person networking": "in_person_tactics",
-            "relationship nurturing": "relationship_nurturing",
-            "metrics to track": "metrics",
-            "weekly networking": "action_plan"
-        }
-        
         # Parse each section
         current_section = None
-        for i, section in enumerate(sections):
-            # Identify which section this is
-            for key, value in section_mapping.items():
-                if i < len(sections) - 1 and any(key in title.lower() for title in [sections[i], sections[i+1]]):
-                    current_section = value
-                    break
+        for section in sections:
+            # Identify which section this is from its title (the first line);
+            # untitled sections continue the previous one
+            title = section.partition("\n")[0].lower()
+            current_section = next(
+                (value for key, value in _NETWORKING_SECTIONS.items() if key in title),
+                current_section
+            )
             
             if current_section:
                 # Extract content (remove potential headers)
-                content = section.strip()
-                lines = [line.strip() for line in content.split('\n') if line.strip()]
+                lines = [line.strip() for line in section.splitlines() if line.strip()]
                 
                 # Remove lines that look like headers
                 filtered_lines = []
                 for line in lines:
-                    if not any(key in line.lower() for key in section_mapping.keys()):
+                    line_lower = line.lower()
+                    if not any(key in line_lower for key in _NETWORKING_SECTIONS):
                         # If line starts with a bullet or number, clean it up
                         if line.startswith('-') or line.startswith('•'):
                             line = line[1:].strip()
-                        elif re.match(r'^\d+\.\s+', line):
-                            line = re.sub(r'^\d+\.\s+', '', line).strip()
+                        elif _NUMBERED_ITEM_RE.match(line):
+                            line = _NUMBERED_ITEM_RE.sub('', line, count=1).strip()
                         
                         if line:
                             filtered_lines.append(line)
@@ -154,13 +345,13 @@ class CommunicationAgent(BaseAgent):
                 if filtered_lines:
                     strategy_data[current_section].extend(filtered_lines)
         
-        # Ensure all sections have at least one item
-        for key in strategy_data:
-            if not strategy_data[key]:
-                strategy_data[key] = ["No specific information provided"]
+        self._fill_strategy_defaults(strategy_data)
         
         return strategy_data
     
-    def get_required_fields(self) -> List[str]:
-        """Get required fields for the communication agent"""
-        return ["career_stage", "industry", "goals"] 
\ No newline at end of file
+    @staticmethod
+    def _fill_strategy_defaults(strategy_data: Dict) -> None:
+        """Ensure all sections have at least one item"""
+        for key in strategy_data:
+            if not strategy_data[key]:
+                strategy_data[key] = ["No specific information provided"]
@@ -1,8 +1,92 @@
-from typing import Dict, List
+import copy
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
 from .base_agent import BaseAgent
-from langchain.prompts import PromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
+
+class CoverLetterImprovements(BaseModel):
+    """Structured cover letter review"""
+    improved_version: str = Field(default="", description="The full improved cover letter")
+    enhancements: List[str] = Field(default_factory=list, description="Specific enhancements made")
+    suggestions: List[str] = Field(default_factory=list, description="Additional suggestions")
+
+# Static instructions go in the system message and the per-request details in
+# the user message, so every request shares a provider-cacheable prompt prefix.
+_COVER_LETTER_SYSTEM_PROMPT = """
+    Generate a professional cover letter based on the job description and
+    candidate information provided by the user.
+    
+    Please write a compelling cover letter that:
+    1. Addresses key job requirements
+    2. Highlights relevant experience and skills
+    3. Shows enthusiasm for the role and company
+    4. Maintains a professional tone in the requested style
+    5. Includes a strong opening and closing
+    """
+
+_COVER_LETTER_PROMPT = """
+    Job Description:
+    {job_description}
+    
+    Candidate Information:
+    {candidate_info}
+    
+    Company: {company_name}
+    Style: {style}
+    """
+
+_LETTER_IMPROVEMENT_SYSTEM_PROMPT = """
+    Review and improve the user's cover letter, focusing on the areas they list.
+    
+    Please provide:
+    1. Improved Version
+    2. Specific Enhancements Made
+    3. Additional Suggestions
+    """
+
+_LETTER_IMPROVEMENT_PROMPT = """
+    Focus Areas:
+    {focus_areas}
+    
+    Cover Letter:
+    {cover_letter}
+    """
+
+_COVER_LETTER_SYSTEM_MESSAGE = SystemMessage(content=_COVER_LETTER_SYSTEM_PROMPT)
+_LETTER_IMPROVEMENT_SYSTEM_MESSAGE = SystemMessage(content=_LETTER_IMPROVEMENT_SYSTEM_PROMPT)
+
+# Bound ``str.format`` of the templates above, called directly on the hot paths
+_COVER_LETTER_FMT = _COVER_LETTER_PROMPT.format
+_LETTER_IMPROVEMENT_FMT = _LETTER_IMPROVEMENT_PROMPT.format
+
+@lru_cache(maxsize=128)
+def _format_cover_letter_request(
+    job_description: str,
+    candidate_text: str,
+    company_name: str,
+    style: str
+) -> str:
+    """Format the cover letter user message once per distinct request"""
+    return _COVER_LETTER_FMT(
+        job_description=job_description,
+        candidate_info=candidate_text,
+        company_name=company_name,
+        style=style
+    )
+
+@lru_cache(maxsize=128)
+def _format_improvement_request(cover_letter: str, focus_text: str) -> str:
+    """Format the letter improvement user message once per distinct request"""
+    return _LETTER_IMPROVEMENT_FMT(cover_letter=cover_letter, focus_areas=focus_text)
 
 class CoverLetterGeneratorAgent(BaseAgent):
+    # Fields required by validate_input
+    _REQUIRED_FIELDS = frozenset({"job_description", "candidate_info", "company_name"})
+    
+    cover_letter_prompt = _COVER_LETTER_PROMPT
+    letter_improvement_prompt = _LETTER_IMPROVEMENT_PROMPT
+    
     def __init__(self, verbose: bool = False):
         super().__init__(
             role="Cover Letter Generator",
@@ -10,52 +94,14 @@ class CoverLetterGeneratorAgent(BaseAgent):
             backstory="Expert in professional writing and tailoring cover letters to specific job requirements",
             verbose=verbose
         )
-        
-        self.cover_letter_prompt = PromptTemplate(
-            input_variables=["job_description", "candidate_info", "company_name", "style"],
-            template="""
-            Generate a professional cover letter based on the following:
-            
-            Job Description:
-            {job_description}
-            
-            Candidate Information:
-            {candidate_info}
-            
-            Company: {company_name}
-            Style: {style}
-            
-            Please write a compelling cover letter that:
-            1. Addresses key job requirements
-            2. Highlights relevant experience and skills
-            3. Shows enthusiasm for the role and company
-            4. Maintains a professional yet {style} tone
-            5. Includes a strong opening and closing
-            """
-        )
-        
-        self.letter_improvement_prompt = PromptTemplate(
-            input_variables=["cover_letter", "focus_areas"],
-            template="""
-            Review and improve the following cover letter focusing on:
-            {focus_areas}
-            
-            Cover Letter:
-            {cover_letter}
-            
-            Please provide:
-            1. Improved Version
-            2. Specific Enhancements Made
-            3. Additional Suggestions
-            """
-        )
     
     def generate_cover_letter(
         self,
         job_description: str,
         candidate_info: Dict,
         company_name: str,
-        style: str = "professional"  # Options: professional, enthusiastic, concise
+        style: str = "professional",  # Options: professional, enthusiastic, concise
+        on_token: Optional[Callable[[str], None]] = None
     ) -> Dict:
         """
         Generate a customized cover letter
@@ -65,83 +111,265 @@ class CoverLetterGeneratorAgent(BaseAgent):
             candidate_info (Dict): Candidate's background information
             company_name (str): Company name
             style (str): Desired tone/style of the letter
+            on_token (Callable[[str], None]): Called with each chunk of the letter as it
+                is generated, so it can be shown before the whole letter is ready
             
         Returns:
             Dict: Generated cover letter and analysis
         """
         try:
-            # Format candidate info
-            candidate_text = "\n".join([
-                f"Experience: {candidate_info.get('experience', '')}",
-                f"Skills: {', '.join(candidate_info.get('skills', []))}",
-                f"Achievements: {', '.join(candidate_info.get('achievements', []))}"
-            ])
-            
-            # Generate cover letter using LLM
-            response = self.llm.invoke(
-                self.cover_letter_prompt.format(
-                    job_description=job_description,
-                    candidate_info=candidate_text,
-                    company_name=company_name,
-                    style=style
-                )
-            ).content
-            
-            # Parse and structure the response
-            cover_letter = {
-                "raw_content": response,
-                "structured_data": self._parse_cover_letter(response)
-            }
-            
-            self._log(f"Generated cover letter for {company_name}")
-            return cover_letter
+            candidate_text = self._format_candidate_info(candidate_info)
+            
+            # Generate cover letter using LLM, reusing earlier letters for the same inputs
+            response = self._cached_invoke(
+                self._cover_letter_messages(job_description, candidate_text, company_name, style),
+                cache_key=self._cover_letter_cache_key(job_description, candidate_text, company_name, style),
+                on_token=on_token
+            )
+            
+            return self._build_cover_letter(company_name, response)
             
         except Exception as e:
             error_msg = self._format_error(e)
             self._log(error_msg)
             raise ValueError(error_msg)
     
+    async def agenerate_cover_letter(
+        self,
+        job_description: str,
+        candidate_info: Dict,
+        company_name: str,
+        style: str = "professional"
+    ) -> Dict:
+        """
+        Async variant of generate_cover_letter.
+        
+        Lets callers overlap it with other agents' LLM calls, e.g.
+        ``await asyncio.gather(generator.agenerate_cover_letter(...), communication.acreate_networking_strategy(...))``.
+        """
+        try:
+            candidate_text = self._format_candidate_info(candidate_info)
+            
+            response = await self._acached_invoke(
+                self._cover_letter_messages(job_description, candidate_text, company_name, style),
+                cache_key=self._cover_letter_cache_key(job_description, candidate_text, company_name, style)
+            )
+            
+            return self._build_cover_letter(company_name, response)
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    def generate_cover_letters(
+        self,
+        jobs: List[Dict],
+        candidate_info: Dict,
+        style: str = "professional"
+    ) -> List[Dict]:
+        """
+        Generate cover letters for several jobs with one batched LLM call
+        
+        Args:
+            jobs (List[Dict]): Jobs with "job_description" and "company_name"
+            candidate_info (Dict): Candidate's background information
+            style (str): Desired tone/style of the letters
+            
+        Returns:
+            List[Dict]: Generated cover letters, in the same order as ``jobs``
+        """
+        try:
+            candidate_text = self._format_candidate_info(candidate_info)
+            
+            responses = self._batch_invoke(
+                [
+                    self._cover_letter_messages(job["job_description"], candidate_text, job["company_name"], style)
+                    for job in jobs
+                ],
+                cache_keys=[
+                    self._cover_letter_cache_key(job["job_description"], candidate_text, job["company_name"], style)
+                    for job in jobs
+                ]
+            )
+            
+            return [
+                self._build_cover_letter(job["company_name"], response)
+                for job, response in zip(jobs, responses)
+            ]
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    @staticmethod
+    def _format_candidate_info(candidate_info: Dict) -> str:
+        """Format candidate info for the cover letter prompt, leaving out empty fields"""
+        parts = []
+        experience = candidate_info.get("experience")
+        if experience:
+            parts.append(f"Experience: {experience}")
+        skills = candidate_info.get("skills")
+        if skills:
+            parts.append(f"Skills: {', '.join(skills)}")
+        achievements = candidate_info.get("achievements")
+        if achievements:
+            parts.append(f"Achievements: {', '.join(achievements)}")
+        return "\n".join(parts)
+    
+    @staticmethod
+    def _cover_letter_messages(
+        job_description: str,
+        candidate_text: str,
+        company_name: str,
+        style: str
+    ) -> List[BaseMessage]:
+        """Build the cover letter messages (static instructions, then the job and candidate)"""
+        return [
+            _COVER_LETTER_SYSTEM_MESSAGE,
+            HumanMessage(content=_format_cover_letter_request(
+                job_description, candidate_text, company_name, style
+            ))
+        ]
+    
+    def _cover_letter_cache_key(
+        self,
+        job_description: str,
+        candidate_text: str,
+        company_name: str,
+        style: str
+    ) -> tuple:
+        """Response cache key for a cover letter request"""
+        # Documents are keyed as written (case and spacing may matter to the
+        # letter); only the short fields are normalized
+        return (
+            ("generate_cover_letter", job_description, candidate_text)
+            + self._normalize_key(company_name, style)
+        )
+    
+    def _build_cover_letter(self, company_name: str, response: str) -> Dict:
+        """Structure a raw cover letter response"""
+        # Parse and structure the response
+        cover_letter = {
+            "raw_content": response,
+            "structured_data": self._parse_cover_letter(response)
+        }
+        
+        self._log(f"Generated cover letter for {company_name}")
+        return cover_letter
+    
     def improve_cover_letter(
         self,
         cover_letter: str,
-        focus_areas: List[str]
+        focus_areas: List[str],
+        on_token: Optional[Callable[[str], None]] = None
     ) -> Dict:
         """
         Improve an existing cover letter
         
+        This polishing pass uses the faster, cheaper model; the letter itself is
+        generated with the default model.
+        
         Args:
             cover_letter (str): Existing cover letter content
             focus_areas (List[str]): Areas to focus improvement on
+            on_token (Callable[[str], None]): Called with each chunk of the response as it
+                arrives; streaming uses a plain-text answer instead of structured output
             
         Returns:
             Dict: Improved version and suggestions
         """
         try:
             # Format focus areas
-            focus_text = "\n".join(f"- {area}" for area in focus_areas)
+            focus_text = self._format_focus_areas(focus_areas)
+            messages = self._improvement_messages(cover_letter, focus_text)
+            cache_key = self._improvement_cache_key(cover_letter, focus_text)
             
-            # Get improvements from LLM
-            response = self.llm.invoke(
-                self.letter_improvement_prompt.format(
-                    cover_letter=cover_letter,
-                    focus_areas=focus_text
-                )
-            ).content
+            if on_token is None:
+                # Ask for the review as structured data; parse a text answer only as a fallback
+                cached = self._cache_get(("structured",) + cache_key)
+                if cached is not None:
+                    self._log("Serving cover letter improvements from cache")
+                    return copy.deepcopy(cached)
+                
+                result = self._structured_invoke(messages, CoverLetterImprovements, llm=self.fast_llm)
+                if result is not None:
+                    improvements = self._build_improvements(result.model_dump_json(), result.model_dump())
+                    self._cache_put(("structured",) + cache_key, copy.deepcopy(improvements))
+                    return improvements
             
-            # Parse and structure the response
-            improvements = {
-                "raw_content": response,
-                "structured_data": self._parse_improvements(response)
-            }
+            # Get improvements from LLM, reusing earlier answers for the same inputs
+            response = self._cached_invoke(
+                messages, cache_key=cache_key, llm=self.fast_llm, on_token=on_token
+            )
             
-            self._log("Generated cover letter improvements")
-            return improvements
+            return self._build_improvements(response)
             
         except Exception as e:
             error_msg = self._format_error(e)
             self._log(error_msg)
             raise ValueError(error_msg)
     
+    async def aimprove_cover_letter(
+        self,
+        cover_letter: str,
+        focus_areas: List[str]
+    ) -> Dict:
+        """Async variant of improve_cover_letter"""
+        try:
+            focus_text = self._format_focus_areas(focus_areas)
+            messages = self._improvement_messages(cover_letter, focus_text)
+            cache_key = self._improvement_cache_key(cover_letter, focus_text)
+            
+            cached = self._cache_get(("structured",) + cache_key)
+            if cached is not None:
+                self._log("Serving cover letter improvements from cache")
+                return copy.deepcopy(cached)
+            
+            result = await self._astructured_invoke(messages, CoverLetterImprovements, llm=self.fast_llm)
+            if result is not None:
+                improvements = self._build_improvements(result.model_dump_json(), result.model_dump())
+                self._cache_put(("structured",) + cache_key, copy.deepcopy(improvements))
+                return improvements
+            
+            response = await self._acached_invoke(messages, cache_key=cache_key, llm=self.fast_llm)
+            
+            return self._build_improvements(response)
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    @staticmethod
+    def _format_focus_areas(focus_areas: List[str]) -> str:
+        """Format focus areas for the letter improvement prompt"""
+        return "\n".join(f"- {area}" for area in focus_areas)
+    
+    @staticmethod
+    def _improvement_messages(cover_letter: str, focus_text: str) -> List[BaseMessage]:
+        """Build the letter improvement messages (static instructions, then the letter)"""
+        return [
+            _LETTER_IMPROVEMENT_SYSTEM_MESSAGE,
+            HumanMessage(content=_format_improvement_request(cover_letter, focus_text))
+        ]
+    
+    def _improvement_cache_key(self, cover_letter: str, focus_text: str) -> tuple:
+        """Response cache key for a letter improvement request"""
+        # The letter is keyed as written; only the focus areas are normalized
+        return ("improve_cover_letter", cover_letter) + self._normalize_key(focus_text)
+    
+    def _build_improvements(self, response: str, parsed_data: Optional[Dict] = None) -> Dict:
+        """Structure a letter improvement response, parsing it unless already structured"""
+        improvements = {
+            "raw_content": response,
+            "structured_data": self._parse_improvements(response) if parsed_data is None else parsed_data
+        }
+        
+        self._log("Generated cover letter improvements")
+        return improvements
+    
     def _parse_cover_letter(self, response: str) -> Dict:
         """Parse the generated cover letter"""
         sections = response.split("\n\n")
@@ -184,17 +412,13 @@ class CoverLetterGeneratorAgent(BaseAgent):
         for section in sections:
             if "Improved Version" in section:
                 current_section = "improved_version"
-                parsed_data["improved_version"] = section.split("\n", 1)[1].strip()
+                parsed_data["improved_version"] = section.partition("\n")[2].strip()
             elif "Specific Enhancements" in section:
                 current_section = "enhancements"
             elif "Additional Suggestions" in section:
                 current_section = "suggestions"
             elif current_section in ["enhancements", "suggestions"] and section.strip():
-                items = [item.strip("- ") for item in section.split("\n") if item.strip()]
+                items = [item.strip("- ") for item in section.splitlines() if item.strip()]
                 parsed_data[current_section].extend(items)
         
         return parsed_data
-    
-    def get_required_fields(self) -> List[str]:
-        """Get required fields for cover letter generation"""
-        return ["job_description", "candidate_info", "company_name"] 
\ No newline at end of file
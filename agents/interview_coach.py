@@ -1,9 +1,126 @@
-from typing import Dict, List
-from .base_agent import BaseAgent
-from langchain.prompts import PromptTemplate
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from .base_agent import BaseAgent, bullet_list, parse_score, strip_bullet
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
 import re
 
+class InterviewQuestions(BaseModel):
+    """Structured interview questions"""
+    technical_questions: List[str] = Field(default_factory=list, description="Technical questions with expected answers")
+    behavioral_questions: List[str] = Field(default_factory=list, description="Behavioral questions with STAR format guidance")
+    scenario_questions: List[str] = Field(default_factory=list, description="Role-specific scenarios")
+    questions_to_ask: List[str] = Field(default_factory=list, description="Questions to ask the interviewer")
+
+class ResponseEvaluation(BaseModel):
+    """Structured evaluation of an interview answer"""
+    score: Optional[int] = Field(default=None, description="Overall score from 0 to 100")
+    strengths: List[str] = Field(default_factory=list, description="Strengths in the response")
+    improvements: List[str] = Field(default_factory=list, description="Areas for improvement")
+    better_response: str = Field(default="", description="Sample better response")
+    tips: List[str] = Field(default_factory=list, description="Additional tips")
+
+# Static instructions go in the system message and the per-request details in
+# the user message, so every request shares a provider-cacheable prompt prefix.
+_QUESTION_GENERATOR_SYSTEM_PROMPT = """
+    Generate relevant interview questions for the role described by the user.
+    
+    Please provide:
+    1. Technical Questions (with expected answers)
+    2. Behavioral Questions (with STAR format guidance)
+    3. Role-specific Scenarios
+    4. Questions to Ask the Interviewer
+    """
+
+_QUESTION_GENERATOR_PROMPT = """
+    Role: {role}
+    Experience Level: {experience_level}
+    Required Skills: {skills}
+    Interview Type: {interview_type}
+    """
+
+_ANSWER_EVALUATION_SYSTEM_PROMPT = """
+    Evaluate the interview response provided by the user.
+    
+    Please provide:
+    1. Overall Score (0-100)
+    2. Strengths in the Response
+    3. Areas for Improvement
+    4. Sample Better Response
+    5. Additional Tips
+    """
+
+_ANSWER_EVALUATION_PROMPT = """
+    Question: {question}
+    Candidate's Answer: {answer}
+    Role: {role}
+    Experience Level: {experience_level}
+    """
+
+_QUESTION_GENERATOR_SYSTEM_MESSAGE = SystemMessage(content=_QUESTION_GENERATOR_SYSTEM_PROMPT)
+_ANSWER_EVALUATION_SYSTEM_MESSAGE = SystemMessage(content=_ANSWER_EVALUATION_SYSTEM_PROMPT)
+
+# Bound ``str.format`` of the templates above, called directly on the hot paths
+_QUESTION_GENERATOR_FMT = _QUESTION_GENERATOR_PROMPT.format
+_ANSWER_EVALUATION_FMT = _ANSWER_EVALUATION_PROMPT.format
+
+@lru_cache(maxsize=128)
+def _format_question_request(
+    role: str,
+    experience_level: str,
+    skills: Tuple[str, ...],
+    interview_type: str
+) -> str:
+    """Format the question generator user message once per distinct request"""
+    return _QUESTION_GENERATOR_FMT(
+        role=role,
+        experience_level=experience_level,
+        skills=bullet_list(skills),
+        interview_type=interview_type
+    )
+
+@lru_cache(maxsize=128)
+def _format_evaluation_request(
+    question: str,
+    answer: str,
+    role: str,
+    experience_level: str
+) -> str:
+    """Format the answer evaluation user message once per distinct request"""
+    return _ANSWER_EVALUATION_FMT(
+        question=question,
+        answer=answer,
+        role=role,
+        experience_level=experience_level
+    )
+
+# Question section headers mapped to the parsed_data key they fill
+_QUESTION_SECTIONS = (
+    ("Technical Questions:", "technical_questions"),
+    ("Behavioral Questions:", "behavioral_questions"),
+    ("Role-specific Scenarios:", "scenario_questions"),
+    ("Questions to Ask", "questions_to_ask")
+)
+
+# Evaluation section headers mapped to the parsed_data key they fill
+_EVALUATION_SECTIONS = (
+    ("Overall Score", "score"),
+    ("Strengths", "strengths"),
+    ("Areas for Improvement", "improvements"),
+    ("Sample Better Response", "better_response"),
+    ("Additional Tips", "tips")
+)
+
+# Leading list number ("1. ") of a question line
+_LEADING_NUMBER_RE = re.compile(r'^\d+\.\s*')
+
 class InterviewCoachAgent(BaseAgent):
+    # Fields required by validate_input
+    _REQUIRED_FIELDS = frozenset({"role", "experience_level"})
+    
+    question_generator_prompt = _QUESTION_GENERATOR_PROMPT
+    answer_evaluation_prompt = _ANSWER_EVALUATION_PROMPT
+    
     def __init__(self, verbose: bool = False):
         super().__init__(
             role="Interview Coach",
@@ -11,43 +128,6 @@ class InterviewCoachAgent(BaseAgent):
             backstory="Expert interview coach with experience in technical and behavioral interviews",
             verbose=verbose
         )
-        
-        self.question_generator_prompt = PromptTemplate(
-            input_variables=["role", "experience_level", "skills", "interview_type"],
-            template="""
-            Generate relevant interview questions for the following:
-            
-            Role: {role}
-            Experience Level: {experience_level}
-            Required Skills: {skills}
-            Interview Type: {interview_type}
-            
-            Please provide:
-            1. Technical Questions (with expected answers)
-            2. Behavioral Questions (with STAR format guidance)
-            3. Role-specific Scenarios
-            4. Questions to Ask the Interviewer
-            """
-        )
-        
-        self.answer_evaluation_prompt = PromptTemplate(
-            input_variables=["question", "answer", "role", "experience_level"],
-            template="""
-            Evaluate the following interview response:
-            
-            Question: {question}
-            Candidate's Answer: {answer}
-            Role: {role}
-            Experience Level: {experience_level}
-            
-            Please provide:
-            1. Overall Score (0-100)
-            2. Strengths in the Response
-            3. Areas for Improvement
-            4. Sample Better Response
-            5. Additional Tips
-            """
-        )
     
     def generate_interview_questions(
         self,
@@ -69,23 +149,28 @@ class InterviewCoachAgent(BaseAgent):
             Dict: Structured interview questions and guidance
         """
         try:
-            # Format skills for prompt
-            skills_text = "\n".join(f"- {skill}" for skill in skills)
-            
-            # Generate questions using LLM
-            response = self.llm.invoke(
-                self.question_generator_prompt.format(
-                    role=role,
-                    experience_level=experience_level,
-                    skills=skills_text,
-                    interview_type=interview_type
-                )
-            ).content
+            # Generate questions using LLM as structured data, reusing earlier questions
+            # for equivalent requests (case, whitespace and skill order do not matter);
+            # a text answer is parsed only as a fallback
+            response, parsed_data = self._structured_or_parsed(
+                [
+                    _QUESTION_GENERATOR_SYSTEM_MESSAGE,
+                    HumanMessage(content=_format_question_request(
+                        role, experience_level, tuple(skills), interview_type
+                    ))
+                ],
+                InterviewQuestions,
+                (
+                    ("generate_interview_questions",)
+                    + self._normalize_key(role, experience_level, interview_type)
+                    + (tuple(sorted(set(self._normalize_key(*skills)))),)
+                ),
+                self._parse_questions
+            )
             
-            # Parse and structure the response
             questions = {
                 "raw_response": response,
-                "structured_data": self._parse_questions(response)
+                "structured_data": parsed_data
             }
             
             self._log(f"Generated interview questions for {role}")
@@ -116,30 +201,246 @@ class InterviewCoachAgent(BaseAgent):
             Dict: Evaluation and feedback
         """
         try:
-            # Get evaluation from LLM
-            response = self.llm.invoke(
-                self.answer_evaluation_prompt.format(
-                    question=question,
-                    answer=answer,
-                    role=role,
-                    experience_level=experience_level
-                )
-            ).content
+            # Get evaluation from LLM as structured data, reusing earlier feedback for
+            # the same answer; a text answer is parsed only as a fallback
+            response, parsed_data = self._structured_or_parsed(
+                self._evaluation_prompt(question, answer, role, experience_level),
+                ResponseEvaluation,
+                self._evaluation_cache_key(question, answer, role, experience_level),
+                self._parse_evaluation
+            )
             
-            # Parse and structure the response
-            evaluation = {
-                "raw_response": response,
-                "structured_data": self._parse_evaluation(response)
-            }
+            return self._build_evaluation(response, parsed_data)
             
-            self._log("Completed response evaluation")
-            return evaluation
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    async def aevaluate_response(
+        self,
+        question: str,
+        answer: str,
+        role: str,
+        experience_level: str
+    ) -> Dict:
+        """
+        Async variant of evaluate_response.
+        
+        Lets callers overlap it with other LLM calls, e.g.
+        ``await asyncio.gather(coach.aevaluate_response(...), job_searcher.aanalyze_job_fit(...))``.
+        """
+        try:
+            response, parsed_data = await self._astructured_or_parsed(
+                self._evaluation_prompt(question, answer, role, experience_level),
+                ResponseEvaluation,
+                self._evaluation_cache_key(question, answer, role, experience_level),
+                self._parse_evaluation
+            )
+            
+            return self._build_evaluation(response, parsed_data)
             
         except Exception as e:
             error_msg = self._format_error(e)
             self._log(error_msg)
             raise ValueError(error_msg)
     
+    def evaluate_response_stream(
+        self,
+        question: str,
+        answer: str,
+        role: str,
+        experience_level: str
+    ) -> Iterator[Dict]:
+        """
+        Evaluate a candidate's interview response, yielding feedback as it is generated
+        
+        The response is streamed and parsed line by line, so the score is
+        available long before the sample answer and tips are written.
+        
+        Args:
+            question (str): Interview question
+            answer (str): Candidate's response
+            role (str): Target job role
+            experience_level (str): Years/level of experience
+            
+        Yields:
+            Dict: The evaluation parsed so far, in the same shape as
+            evaluate_response; the last item is the complete evaluation
+        """
+        try:
+            cache_key = self._evaluation_cache_key(question, answer, role, experience_level)
+            cached = self._cached_evaluation(cache_key)
+            if cached is not None:
+                yield cached
+                return
+            
+            chunks = []
+            sections = {}
+            current = None
+            for line in self._stream_lines(
+                self._evaluation_prompt(question, answer, role, experience_level), chunks
+            ):
+                if line.strip():
+                    current = self._group_line(line, _EVALUATION_SECTIONS, sections, current)
+                    yield {
+                        "raw_response": "".join(chunks),
+                        "structured_data": self._evaluation_data(sections)
+                    }
+            
+            response = "".join(chunks)
+            self._cache_put(cache_key, response)
+            yield self._build_evaluation(response, self._evaluation_data(sections))
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    async def aevaluate_response_stream(
+        self,
+        question: str,
+        answer: str,
+        role: str,
+        experience_level: str
+    ) -> AsyncIterator[Dict]:
+        """Async variant of evaluate_response_stream using ``llm.astream``"""
+        try:
+            cache_key = self._evaluation_cache_key(question, answer, role, experience_level)
+            cached = self._cached_evaluation(cache_key)
+            if cached is not None:
+                yield cached
+                return
+            
+            chunks = []
+            sections = {}
+            current = None
+            async for line in self._astream_lines(
+                self._evaluation_prompt(question, answer, role, experience_level), chunks
+            ):
+                if line.strip():
+                    current = self._group_line(line, _EVALUATION_SECTIONS, sections, current)
+                    yield {
+                        "raw_response": "".join(chunks),
+                        "structured_data": self._evaluation_data(sections)
+                    }
+            
+            response = "".join(chunks)
+            self._cache_put(cache_key, response)
+            yield self._build_evaluation(response, self._evaluation_data(sections))
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    def evaluate_responses(
+        self,
+        answers: List[Dict],
+        role: str,
+        experience_level: str
+    ) -> List[Dict]:
+        """
+        Evaluate several interview responses with one batched LLM call
+        
+        Args:
+            answers (List[Dict]): Items with "question" and "answer"
+            role (str): Target job role
+            experience_level (str): Years/level of experience
+            
+        Returns:
+            List[Dict]: Evaluation and feedback, in the same order as ``answers``
+        """
+        try:
+            # Answers share evaluate_response's cache, structured or streamed
+            evaluations = self._structured_or_parsed_batch(
+                [
+                    self._evaluation_prompt(item["question"], item["answer"], role, experience_level)
+                    for item in answers
+                ],
+                ResponseEvaluation,
+                [
+                    self._evaluation_cache_key(item["question"], item["answer"], role, experience_level)
+                    for item in answers
+                ],
+                self._parse_evaluation
+            )
+            
+            return [self._build_evaluation(response, parsed_data) for response, parsed_data in evaluations]
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    async def aevaluate_responses(
+        self,
+        answers: List[Dict],
+        role: str,
+        experience_level: str
+    ) -> List[Dict]:
+        """Async variant of evaluate_responses; requests run concurrently up to Config.LLM_MAX_CONCURRENCY"""
+        try:
+            evaluations = await self._astructured_or_parsed_batch(
+                [
+                    self._evaluation_prompt(item["question"], item["answer"], role, experience_level)
+                    for item in answers
+                ],
+                ResponseEvaluation,
+                [
+                    self._evaluation_cache_key(item["question"], item["answer"], role, experience_level)
+                    for item in answers
+                ],
+                self._parse_evaluation
+            )
+            
+            return [self._build_evaluation(response, parsed_data) for response, parsed_data in evaluations]
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    def _evaluation_prompt(
+        self,
+        question: str,
+        answer: str,
+        role: str,
+        experience_level: str
+    ) -> List[BaseMessage]:
+        """Build the answer evaluation messages (static instructions, then the answer)"""
+        return [
+            _ANSWER_EVALUATION_SYSTEM_MESSAGE,
+            HumanMessage(content=_format_evaluation_request(
+                question, answer, role, experience_level
+            ))
+        ]
+    
+    def _evaluation_cache_key(
+        self,
+        question: str,
+        answer: str,
+        role: str,
+        experience_level: str
+    ) -> tuple:
+        """Response cache key for an answer evaluation request"""
+        return ("evaluate_response",) + self._normalize_key(question, answer, role, experience_level)
+    
+    def _cached_evaluation(self, cache_key: tuple) -> Optional[Dict]:
+        """An earlier evaluation of the same answer, structured (as evaluate_response caches it) or streamed"""
+        cached = self._structured_cache_get(cache_key, self._parse_evaluation)
+        return None if cached is None else self._build_evaluation(*cached)
+    
+    def _build_evaluation(self, response: str, parsed_data: Optional[Dict] = None) -> Dict:
+        """Structure an answer evaluation response, parsing it unless already structured"""
+        evaluation = {
+            "raw_response": response,
+            "structured_data": self._parse_evaluation(response) if parsed_data is None else parsed_data
+        }
+        
+        self._log("Completed response evaluation")
+        return evaluation
+    
     def _parse_questions(self, response: str) -> Dict:
         """Parse the generated interview questions with improved error handling"""
         parsed_data = {
@@ -160,84 +461,54 @@ class InterviewCoachAgent(BaseAgent):
                     continue
                 
                 # Check for section headers
-                if "Technical Questions:" in line:
-                    current_section = "technical_questions"
-                    continue
-                elif "Behavioral Questions:" in line:
-                    current_section = "behavioral_questions"
-                    continue
-                elif "Role-specific Scenarios:" in line:
-                    current_section = "scenario_questions"
-                    continue
-                elif "Questions to Ask" in line:
-                    current_section = "questions_to_ask"
+                section = next(
+                    (key for header, key in _QUESTION_SECTIONS if header in line),
+                    None
+                )
+                if section:
+                    current_section = section
                     continue
                 
                 # Extract questions
-                # Remove leading numbers and special characters
-                if line and current_section:
-                    # Remove leading numbers (1., 2., etc.)
-                    question = re.sub(r'^\d+\.\s*', '', line).strip()
-                    
-                    # Skip if it's empty after cleaning
-                    if not question:
-                        continue
-                        
-                    # Skip if it's a section header
-                    if any(header in question for header in ["Technical Questions:", "Behavioral Questions:", 
-                                                           "Role-specific Scenarios:", "Questions to Ask"]):
-                        continue
+                if current_section:
+                    # Remove leading numbers (1., 2., etc.) or bullets
+                    question = strip_bullet(_LEADING_NUMBER_RE.sub('', line, count=1))
                     
                     # Add the question to the appropriate section
                     if len(question) > 5:  # Ensure it's a valid question
                         parsed_data[current_section].append(question)
             
-            # Debug output
-            for section, questions in parsed_data.items():
-                print(f"Parsed {section}: {len(questions)} questions")
-                for q in questions:
-                    print(f"- {q}")
+            if self.verbose:
+                self._log("Parsed questions: " + ", ".join(
+                    f"{section}={len(questions)}" for section, questions in parsed_data.items()
+                ))
             
             return parsed_data
             
         except Exception as e:
-            print(f"Error parsing questions: {str(e)}")
-            print(f"Raw response being parsed: {response}")
+            self._log(f"Error parsing questions: {str(e)}")
             return parsed_data
     
     def _parse_evaluation(self, response: str) -> Dict:
         """Parse the response evaluation"""
-        sections = response.split("\n\n")
+        return self._evaluation_data(self._group_lines(response, _EVALUATION_SECTIONS))
+    
+    @staticmethod
+    def _evaluation_data(sections: Dict[str, List[str]]) -> Dict:
+        """Build the evaluation data from the grouped lines of an evaluation response"""
         parsed_data = {
             "score": None,
             "strengths": [],
             "improvements": [],
-            "better_response": "",
+            "better_response": "\n".join(sections.get("better_response", [])),
             "tips": []
         }
         
-        current_section = None
-        for section in sections:
-            if "Overall Score" in section:
-                try:
-                    parsed_data["score"] = int(section.split(":")[1].strip().split()[0])
-                except:
-                    pass
-            elif "Strengths" in section:
-                current_section = "strengths"
-            elif "Areas for Improvement" in section:
-                current_section = "improvements"
-            elif "Sample Better Response" in section:
-                current_section = "better_response"
-                parsed_data["better_response"] = section.split("\n", 1)[1].strip()
-            elif "Additional Tips" in section:
-                current_section = "tips"
-            elif current_section in ["strengths", "improvements", "tips"] and section.strip():
-                items = [item.strip("- ") for item in section.split("\n") if item.strip()]
-                parsed_data[current_section].extend(items)
+        score_lines = sections.get("score")
+        if score_lines:
+            parsed_data["score"] = parse_score(score_lines[0])
+        
+        for key in ("strengths", "improvements", "tips"):
+            parsed_data[key] = [strip_bullet(item) for item in sections.get(key, [])]
         
         return parsed_data
-    
-    def get_required_fields(self) -> List[str]:
-        """Get required fields for interview coaching"""
-        return ["role", "experience_level"] 
\ No newline at end of file
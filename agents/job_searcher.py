@@ -1,10 +1,80 @@
+import orjson
 import requests
-from typing import Dict, List
-from .base_agent import BaseAgent
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Tuple
+from urllib3.util.retry import Retry
+from .base_agent import BaseAgent, bullet_list, parse_score, strip_bullet
 from config.config import Config
-from langchain.prompts import PromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, Field
+
+class JobFitAnalysis(BaseModel):
+    """Structured job fit analysis"""
+    match_score: Optional[int] = Field(default=None, description="Match score from 0 to 100")
+    matching_skills: List[str] = Field(default_factory=list, description="Key user skills the job asks for")
+    missing_skills: List[str] = Field(default_factory=list, description="Skills the job asks for that the user lacks")
+    recommendations: List[str] = Field(default_factory=list, description="Recommendations for the application")
+
+# Static instructions go in the system message and the per-request details in
+# the user message, so every request shares a provider-cacheable prompt prefix.
+_JOB_MATCHING_SYSTEM_PROMPT = """
+    Analyze the job description and user skills provided by the user to determine job fit.
+    
+    Please provide:
+    1. Match Score (0-100)
+    2. Key Matching Skills
+    3. Missing Skills
+    4. Recommendations for Application
+    """
+
+_JOB_MATCHING_PROMPT = """
+    Job Description:
+    {job_description}
+    
+    User Skills:
+    {user_skills}
+    """
+
+_JOB_MATCHING_SYSTEM_MESSAGE = SystemMessage(content=_JOB_MATCHING_SYSTEM_PROMPT)
+
+# Bound ``str.format`` of the template above, called directly on the hot path
+_JOB_MATCHING_FMT = _JOB_MATCHING_PROMPT.format
+
+@lru_cache(maxsize=128)
+def _format_job_fit_request(job_description: str, user_skills: Tuple[str, ...]) -> str:
+    """Format the job matching user message once per distinct request"""
+    return _JOB_MATCHING_FMT(job_description=job_description, user_skills=bullet_list(user_skills))
+
+# (connect, read) timeout in seconds for Adzuna requests
+_ADZUNA_TIMEOUT = (3.05, 10)
+
+@lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    """Return the HTTP session (keep-alive connection pool) shared by every job search"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount("https://", adapter)
+    return session
+
+# Job fit section headers mapped to the parsed_data key they fill
+_JOB_FIT_SECTIONS = (
+    ("Match Score", "match_score"),
+    ("Key Matching Skills", "matching_skills"),
+    ("Missing Skills", "missing_skills"),
+    ("Recommendations", "recommendations")
+)
 
 class JobSearchAgent(BaseAgent):
+    # Fields required by validate_input
+    _REQUIRED_FIELDS = frozenset({"keywords"})
+    
+    job_matching_prompt = _JOB_MATCHING_PROMPT
+    
     def __init__(self, verbose: bool = False):
         super().__init__(
             role="Job Search Expert",
@@ -12,25 +82,6 @@ class JobSearchAgent(BaseAgent):
             backstory="Expert in job market analysis and matching candidates with suitable positions",
             verbose=verbose
         )
-        
-        self.job_matching_prompt = PromptTemplate(
-            input_variables=["job_description", "user_skills"],
-            template="""
-            Analyze the following job description and user skills to determine job fit:
-            
-            Job Description:
-            {job_description}
-            
-            User Skills:
-            {user_skills}
-            
-            Please provide:
-            1. Match Score (0-100)
-            2. Key Matching Skills
-            3. Missing Skills
-            4. Recommendations for Application
-            """
-        )
     
     def search_jobs(
         self, 
@@ -67,17 +118,16 @@ class JobSearchAgent(BaseAgent):
                 "content-type": "application/json"
             }
             
-            # Make API request
-            response = requests.get(base_url, params=params)
+            # Make API request over the pooled session
+            response = _get_session().get(base_url, params=params, timeout=_ADZUNA_TIMEOUT)
             response.raise_for_status()
             
-            # Parse response
-            jobs_data = response.json()
+            # Parse response (orjson parses the raw bytes in one C pass)
+            jobs_data = orjson.loads(response.content)
             
             # Extract relevant job information
-            jobs = []
-            for job in jobs_data.get("results", []):
-                jobs.append({
+            jobs = [
+                {
                     "title": job.get("title"),
                     "company": job.get("company", {}).get("display_name"),
                     "location": job.get("location", {}).get("display_name"),
@@ -85,7 +135,9 @@ class JobSearchAgent(BaseAgent):
                     "salary_min": job.get("salary_min"),
                     "salary_max": job.get("salary_max"),
                     "url": job.get("redirect_url")
-                })
+                }
+                for job in jobs_data.get("results", [])
+            ]
             
             self._log(f"Found {len(jobs)} matching jobs")
             return jobs
@@ -107,33 +159,108 @@ class JobSearchAgent(BaseAgent):
             Dict: Analysis of job fit
         """
         try:
-            # Format skills for prompt
-            skills_text = "\n".join(f"- {skill}" for skill in user_skills)
-            
-            # Get analysis from LLM using invoke instead of predict
-            response = self.llm.invoke(
-                self.job_matching_prompt.format(
-                    job_description=job_description,
-                    user_skills=skills_text
-                )
-            ).content
-            
-            # Parse response
-            analysis = {
-                "raw_analysis": response,
-                "structured_data": self._parse_job_fit_response(response)
-            }
+            # Get analysis from LLM as structured data, reusing earlier answers for
+            # the same job and skills; a text answer is parsed only as a fallback
+            response, parsed_data = self._structured_or_parsed(
+                self._job_fit_prompt(job_description, user_skills),
+                JobFitAnalysis,
+                self._job_fit_cache_key(job_description, user_skills),
+                self._parse_job_fit_response
+            )
+            
+            return self._build_job_fit(response, parsed_data)
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    async def aanalyze_job_fit(self, job_description: str, user_skills: List[str]) -> Dict:
+        """Async variant of analyze_job_fit, for overlapping it with other LLM calls"""
+        try:
+            response, parsed_data = await self._astructured_or_parsed(
+                self._job_fit_prompt(job_description, user_skills),
+                JobFitAnalysis,
+                self._job_fit_cache_key(job_description, user_skills),
+                self._parse_job_fit_response
+            )
+            
+            return self._build_job_fit(response, parsed_data)
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    def analyze_job_fits(self, job_descriptions: List[str], user_skills: List[str]) -> List[Dict]:
+        """
+        Analyze several jobs against the user's skills with one batched LLM call
+        
+        Args:
+            job_descriptions (List[str]): Job descriptions to analyze
+            user_skills (List[str]): List of user's skills
             
-            return analysis
+        Returns:
+            List[Dict]: Analysis of job fit, in the same order as ``job_descriptions``
+        """
+        try:
+            # Requests share analyze_job_fit's cache, so jobs analyzed before are not paid again
+            answers = self._structured_or_parsed_batch(
+                [self._job_fit_prompt(description, user_skills) for description in job_descriptions],
+                JobFitAnalysis,
+                [self._job_fit_cache_key(description, user_skills) for description in job_descriptions],
+                self._parse_job_fit_response
+            )
+            
+            return [self._build_job_fit(response, parsed_data) for response, parsed_data in answers]
             
         except Exception as e:
             error_msg = self._format_error(e)
             self._log(error_msg)
             raise ValueError(error_msg)
     
+    async def aanalyze_job_fits(self, job_descriptions: List[str], user_skills: List[str]) -> List[Dict]:
+        """Async variant of analyze_job_fits; requests run concurrently up to Config.LLM_MAX_CONCURRENCY"""
+        try:
+            answers = await self._astructured_or_parsed_batch(
+                [self._job_fit_prompt(description, user_skills) for description in job_descriptions],
+                JobFitAnalysis,
+                [self._job_fit_cache_key(description, user_skills) for description in job_descriptions],
+                self._parse_job_fit_response
+            )
+            
+            return [self._build_job_fit(response, parsed_data) for response, parsed_data in answers]
+            
+        except Exception as e:
+            error_msg = self._format_error(e)
+            self._log(error_msg)
+            raise ValueError(error_msg)
+    
+    def _job_fit_prompt(self, job_description: str, user_skills: List[str]) -> List[BaseMessage]:
+        """Build the job matching messages (static instructions, then the job and skills)"""
+        return [
+            _JOB_MATCHING_SYSTEM_MESSAGE,
+            HumanMessage(content=_format_job_fit_request(job_description, tuple(user_skills)))
+        ]
+    
+    def _job_fit_cache_key(self, job_description: str, user_skills: List[str]) -> tuple:
+        """Response cache key for a job fit request"""
+        return (
+            ("analyze_job_fit",)
+            + self._normalize_key(job_description)
+            + (self._normalize_key(*user_skills),)
+        )
+    
+    def _build_job_fit(self, response: str, parsed_data: Optional[Dict] = None) -> Dict:
+        """Structure a job fit response, parsing it unless already structured"""
+        return {
+            "raw_analysis": response,
+            "structured_data": self._parse_job_fit_response(response) if parsed_data is None else parsed_data
+        }
+    
     def _parse_job_fit_response(self, response: str) -> Dict:
         """Parse the job fit analysis response"""
-        sections = response.split("\n\n")
+        sections = self._group_lines(response, _JOB_FIT_SECTIONS)
         parsed_data = {
             "match_score": None,
             "matching_skills": [],
@@ -141,25 +268,12 @@ class JobSearchAgent(BaseAgent):
             "recommendations": []
         }
         
-        for section in sections:
-            if "Match Score" in section:
-                # Extract number from text (e.g., "Match Score: 85" -> 85)
-                try:
-                    parsed_data["match_score"] = int(section.split(":")[1].strip().split()[0])
-                except:
-                    pass
-            elif "Key Matching Skills" in section:
-                skills = section.split("\n")[1:]
-                parsed_data["matching_skills"] = [s.strip("- ") for s in skills if s.strip()]
-            elif "Missing Skills" in section:
-                skills = section.split("\n")[1:]
-                parsed_data["missing_skills"] = [s.strip("- ") for s in skills if s.strip()]
-            elif "Recommendations" in section:
-                recs = section.split("\n")[1:]
-                parsed_data["recommendations"] = [r.strip("- ") for r in recs if r.strip()]
+        # Extract number from text (e.g., "Match Score: 85/100" -> 85)
+        score_lines = sections.get("match_score")
+        if score_lines:
+            parsed_data["match_score"] = parse_score(score_lines[0])
+        
+        for key in ("matching_skills", "missing_skills", "recommendations"):
+            parsed_data[key] = [strip_bullet(item) for item in sections.get(key, [])]
         
         return parsed_data
-    
-    def get_required_fields(self) -> List[str]:
-        """Get required fields for job search"""
-        return ["keywords"] 
\ No newline at end of file
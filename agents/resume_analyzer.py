@@ -1,13 +1,215 @@
+import copy
+import hashlib
+import io
 import re
 import os
-from typing import Dict, List, Set, Any
-import pdfplumber
-from langchain.prompts import PromptTemplate
-from .base_agent import BaseAgent
+from typing import Dict, List, Set, Any, Tuple
+from langchain_core.messages import HumanMessage, SystemMessage
+from .base_agent import BaseAgent, strip_bullet
 from config.config import Config
 import traceback
 from collections import OrderedDict
 
+# Static instructions go in the system message and the resume in the user
+# message, so every request shares a provider-cacheable prompt prefix.
+_RESUME_ANALYSIS_SYSTEM_PROMPT = """
+            Analyze the resume text provided by the user and extract key information in a structured format.
+
+            Please provide the following information in a structured format:
+            1. Current Role: [Most recent/current position]
+            2. Years of Experience: [Total years of professional experience]
+            3. Skills: [List of technical and soft skills, excluding single letters or common words]
+            4. Education: [List of educational qualifications]
+            5. Professional Summary: [Brief professional summary]
+
+            Format the response as:
+            CURRENT_ROLE: [role]
+            EXPERIENCE: [years]
+            SKILLS: [skill1, skill2, ...]
+            EDUCATION: [edu1, edu2, ...]
+            SUMMARY: [summary]
+            """
+
+_RESUME_ANALYSIS_TEMPLATE = """
+            Resume:
+            {text}
+            """
+
+_SECTION_ANALYSIS_SYSTEM_PROMPT = """
+            Analyze the resume sections provided by the user and provide detailed insights.
+            
+            Please provide a structured analysis in the following format:
+            
+            PROFESSIONAL_SUMMARY:
+            [Write a compelling 2-3 sentence summary highlighting key experience, skills, and career trajectory]
+            
+            KEY_STRENGTHS:
+            - [Strength 1: Specific example from experience]
+            - [Strength 2: Specific example from experience]
+            - [Strength 3: Technical expertise demonstration]
+            
+            CAREER_PROGRESSION:
+            - [Analysis of career growth and progression]
+            - [Pattern in role changes and responsibilities]
+            
+            TECHNICAL_ASSESSMENT:
+            - [Evaluation of technical skills relevance]
+            - [Identification of skill gaps]
+            - [Technology stack analysis]
+            
+            AREAS_FOR_IMPROVEMENT:
+            - [Specific improvement 1 with actionable suggestion]
+            - [Specific improvement 2 with actionable suggestion]
+            - [Skill gap closure recommendation]
+            
+            RECOMMENDATIONS:
+            - [Career development suggestion 1]
+            - [Skill enhancement priority 1]
+            - [Industry-specific recommendation]
+            """
+
+_SECTION_ANALYSIS_TEMPLATE = """
+            PROFESSIONAL SUMMARY:
+            {summary}
+            
+            WORK EXPERIENCE:
+            {experience}
+            
+            EDUCATION:
+            {education}
+            
+            SKILLS:
+            {skills}
+            """
+
+_RESUME_ANALYSIS_SYSTEM_MESSAGE = SystemMessage(content=_RESUME_ANALYSIS_SYSTEM_PROMPT)
+_SECTION_ANALYSIS_SYSTEM_MESSAGE = SystemMessage(content=_SECTION_ANALYSIS_SYSTEM_PROMPT)
+
+# Field headers of the LLM resume analysis mapped to the parsed key they fill
+_LLM_RESPONSE_FIELDS = {
+    "CURRENT_ROLE": "current_role",
+    "EXPERIENCE": "experience",
+    "SKILLS": "skills",
+    "EDUCATION": "education",
+    "SUMMARY": "professional_summary"
+}
+
+# Section headers of the section analysis response mapped to the analysis key they fill
+_SECTION_ANALYSIS_KEYS = {
+    "PROFESSIONAL_SUMMARY": "summary",
+    "KEY_STRENGTHS": "strengths",
+    "CAREER_PROGRESSION": "career_progression",
+    "TECHNICAL_ASSESSMENT": "technical_assessment",
+    "AREAS_FOR_IMPROVEMENT": "improvements",
+    "RECOMMENDATIONS": "recommendations"
+}
+
+# A section analysis header at the start of a line ("KEY_STRENGTHS:", "**KEY_STRENGTHS:**");
+# the rest of the header line belongs to the section body
+_SECTION_ANALYSIS_HEADER_RE = re.compile(
+    r'^[ \t#*]*(' + '|'.join(_SECTION_ANALYSIS_KEYS) + r')\b[*]*:?[*]*[ \t]*',
+    re.MULTILINE
+)
+
+# Extended special character mappings for clean_extracted_text
+_CLEAN_TEXT_REPLACEMENTS = {
+    # Bullets and Dashes ('\u2022' bullets are kept as is)
+    '\u2043': '-',  # hyphen bullet
+    '\u2012': '-',  # figure dash
+    '\u2013': '-',  # en dash
+    '\u2014': '-',  # em dash
+    '\u2015': '-',  # horizontal bar
+    '\u2053': '-',  # swung dash
+    
+    # Quotes and Apostrophes
+    '\u2018': "'",  # left single quotation
+    '\u2019': "'",  # right single quotation
+    '\u201C': '"',  # left double quotation
+    '\u201D': '"',  # right double quotation
+    '\u2032': "'",  # prime
+    '\u2033': '"',  # double prime
+    
+    # Spaces and Breaks
+    '\u00A0': ' ',  # non-breaking space
+    '\u200B': '',   # zero-width space
+    '\u200C': '',   # zero-width non-joiner
+    '\u200D': '',   # zero-width joiner
+    '\u2028': '\n', # line separator
+    '\u2029': '\n', # paragraph separator
+    
+    # Symbols
+    '\u2023': '•',  # triangular bullet
+    '\u25CF': '•',  # black circle
+    '\u2212': '-',  # minus sign
+    
+    # Common PDF artifacts
+    '\uf0b7': '-',  # PDF bullet
+    '\uf0a7': '-',  # PDF bullet variant
+    '\uf0d8': '-',  # PDF up arrow
+    '\uf0d9': '-',  # PDF left arrow
+    '\uf0da': '-',  # PDF right arrow
+    
+    # Typography
+    '\u2026': '...',  # horizontal ellipsis
+    '\u2122': '(TM)',  # trade mark sign
+    '\u00AE': '(R)',   # registered sign
+    '\u00A9': '(C)',   # copyright sign
+    
+    # Currency
+    '\u20AC': 'EUR',  # euro
+    '\u00A3': 'GBP',  # pound
+    '\u00A5': 'JPY',  # yen
+    '\u20B9': 'INR',  # rupee
+}
+
+# preprocess_text normalizations: each group is one alternation over whole
+# words, applied in a single pass with its match looked up in the map below
+_MONTH_MAP = {
+    'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04', 'may': '05', 'jun': '06',
+    'jul': '07', 'aug': '08', 'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12'
+}
+_MONTH_RE = re.compile(
+    r'\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?'
+    r'|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b',
+    re.IGNORECASE
+)
+
+_DEGREE_MAP = {
+    'btech': 'Bachelor of Technology',
+    'mtech': 'Master of Technology',
+    'be': 'Bachelor of Engineering',
+    'me': 'Master of Engineering',
+    'bsc': 'Bachelor of Science',
+    'msc': 'Master of Science',
+    'phd': 'Doctor of Philosophy',
+    'mba': 'Master of Business Administration'
+}
+# "BE"/"ME" without dots only in capitals, so the words "be" and "me" are left alone
+_DEGREE_RE = re.compile(
+    r'\b(b\.?tech|m\.?tech|b\.e|m\.e|(?-i:BE|ME)|b\.?sc|m\.?sc|ph\.?d|mba)\b\.?',
+    re.IGNORECASE
+)
+
+_TITLE_MAP = {
+    'sr': 'Senior ', 'jr': 'Junior ', 'mgr': 'Manager ', 'dir': 'Director ',
+    'exec': 'Executive ', 'asst': 'Assistant ', 'assoc': 'Associate '
+}
+_TITLE_RE = re.compile(r'\b(sr|jr|mgr|dir|exec|asst|assoc)\b\.?\s*', re.IGNORECASE)
+
+def _month_number(match: re.Match) -> str:
+    return _MONTH_MAP[match.group(1)[:3].lower()]
+
+def _degree_name(match: re.Match) -> str:
+    return _DEGREE_MAP[match.group(1).lower().replace('.', '')]
+
+def _title_name(match: re.Match) -> str:
+    return _TITLE_MAP[match.group(1).lower()]
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+_LINE_EDGE_SPACE_RE = re.compile(r'^\s+|\s+$', re.MULTILINE)
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
 class ResumeAnalyzerAgent(BaseAgent):
     def __init__(self, verbose: bool = False, cache_size: int = 100):
         super().__init__(
@@ -18,7 +220,7 @@ class ResumeAnalyzerAgent(BaseAgent):
         )
         
         # Initialize both pattern-based and LLM-based analyzers
-        self.invalid_skills = {
+        self.invalid_skills = frozenset({
             # Single letters
             'r', 'go', 'a', 'c', 'in', 
             # Common words
@@ -27,12 +229,12 @@ class ResumeAnalyzerAgent(BaseAgent):
             'api', 'app', 'web', 'gui', 'css', 'db', 'qa', 'ui', 'ux',
             # Others
             'etc', 'eg', 'ie', 'ex', 'vs'
-        }
+        })
         
-        self.valid_short_skills = {
+        self.valid_short_skills = frozenset({
             'c++', 'c#', '.net', 'php', 'ios', 'api', 'css', 'aws', 'gcp',
             'sql', 'r&d', 'ui', 'ux', 'qa'
-        }
+        })
         self.tech_skills_patterns = {
             'programming': [
                 r'python|java|javascript|typescript|c\+\+|ruby|php|swift|kotlin|rust',
@@ -110,25 +312,74 @@ class ResumeAnalyzerAgent(BaseAgent):
             }
         }
 
-        # Pre-compile regular expressions for better performance
-        self.skills_pattern = re.compile(r'your_pattern_here', re.IGNORECASE)
-        self.education_pattern = re.compile(r'your_pattern_here', re.IGNORECASE)
+        # Pre-compile the pattern tables above once per agent
+        self._tech_skill_res = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for category, patterns in self.tech_skills_patterns.items()
+        }
+        # One alternation per category, so a single scan finds all of its skills
+        self._tech_skill_category_res = {
+            category: re.compile('|'.join(patterns), re.IGNORECASE)
+            for category, patterns in self.tech_skills_patterns.items()
+        }
+        self._section_header_res = {
+            section: [re.compile(header, re.IGNORECASE) for header in spec['headers']]
+            for section, spec in self.section_patterns.items()
+        }
+        # Every section's headers in one alternation, so a line is matched once and
+        # the named group that matched is its section (inline flags are dropped,
+        # as they are only allowed at the start of the combined pattern)
+        self._section_header_re = re.compile('|'.join(
+            f"(?P<{section}>" + '|'.join(
+                header[4:] if header.startswith('(?i)') else header
+                for header in spec['headers']
+            ) + ")"
+            for section, spec in self.section_patterns.items()
+        ), re.IGNORECASE)
+        self._section_indicator_res = {
+            section: [re.compile(indicator, re.IGNORECASE) for indicator in spec['indicators']]
+            for section, spec in self.section_patterns.items()
+        }
         
         # Cache for expensive operations
         self.cache_size = cache_size
         self._section_pattern_cache = OrderedDict()  # Use OrderedDict for LRU cache
         self._skill_confidence_cache = OrderedDict()
+        self._pdf_text_cache = OrderedDict()  # Extracted text keyed by file content hash
+        self._resume_result_cache = OrderedDict()  # process_resume results keyed by file content hash
 
     # Group 1: File and Text Processing
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text content from a PDF resume with better handling"""
+        return self._extract_text_from_bytes(*self._read_pdf(pdf_path))
+
+    @staticmethod
+    def _read_pdf(pdf_path: str) -> Tuple[bytes, str]:
+        """Read a PDF resume, returning its bytes and their content hash (the cache key)"""
+        try:
+            with open(pdf_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            raise ValueError(f"Error extracting text from PDF: {str(e)}")
+        return data, hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _extract_text_from_bytes(self, data: bytes, cache_key: str) -> str:
+        """Extract text content from the bytes of a PDF resume"""
         try:
-            text = ""
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    extracted = page.extract_text()
-                    if extracted:
-                        text += extracted + "\n"
+            # The same file uploaded again (e.g. on every Streamlit rerun) reuses
+            # the text extracted before instead of parsing it again
+            if cache_key in self._pdf_text_cache:
+                self._pdf_text_cache.move_to_end(cache_key)
+                return self._pdf_text_cache[cache_key]
+            
+            # PDFium returns each page's plain text without the per-character
+            # layout analysis pdfplumber performs; pdfplumber remains the
+            # fallback for older installs without pypdfium2
+            try:
+                parts = self._pdfium_page_texts(data)
+            except ImportError:
+                parts = self._pdfplumber_page_texts(data)
+            text = "\n".join(parts)
             
             if not text.strip():
                 raise ValueError("No text could be extracted from the PDF")
@@ -136,72 +387,54 @@ class ResumeAnalyzerAgent(BaseAgent):
             # Clean the extracted text
             text = self.clean_extracted_text(text)
             
+            self._pdf_text_cache[cache_key] = text
+            self._manage_cache_size(self._pdf_text_cache)
             return text
         except Exception as e:
             raise ValueError(f"Error extracting text from PDF: {str(e)}")
 
+    @staticmethod
+    def _pdfium_page_texts(data: bytes) -> List[str]:
+        """Plain text of the first resume pages, read with PDFium"""
+        # Imported on first use, so pages that never read a PDF do not pay for it
+        import pypdfium2 as pdfium
+        
+        parts = []
+        pdf = pdfium.PdfDocument(data)
+        try:
+            for index in range(min(len(pdf), Config.MAX_RESUME_PAGES)):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                extracted = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                if extracted:
+                    # PDFium separates lines with CRLF
+                    parts.append(extracted.replace("\r\n", "\n"))
+        finally:
+            pdf.close()
+        return parts
+
+    @staticmethod
+    def _pdfplumber_page_texts(data: bytes) -> List[str]:
+        """Plain text of the first resume pages, read with pdfplumber"""
+        import pdfplumber
+        
+        # Each page's layout data is released as soon as its text is extracted
+        parts = []
+        with pdfplumber.open(io.BytesIO(data), pages=range(1, Config.MAX_RESUME_PAGES + 1)) as pdf:
+            for page in pdf.pages:
+                extracted = page.extract_text()
+                page.close()
+                if extracted:
+                    parts.append(extracted)
+        return parts
+
     def clean_extracted_text(self, text: str) -> str:
         """Enhanced text cleaning with comprehensive character mappings"""
-        # Extended special character mappings
-        replacements = {
-            # Bullets and Dashes
-            '\u2022': '-',  # bullet
-            '\u2023': '-',  # triangular bullet
-            '\u2043': '-',  # hyphen bullet
-            '\u2012': '-',  # figure dash
-            '\u2013': '-',  # en dash
-            '\u2014': '-',  # em dash
-            '\u2015': '-',  # horizontal bar
-            '\u2053': '-',  # swung dash
-            '\u2043': '-',  # hyphen bullet
-            
-            # Quotes and Apostrophes
-            '\u2018': "'",  # left single quotation
-            '\u2019': "'",  # right single quotation
-            '\u201C': '"',  # left double quotation
-            '\u201D': '"',  # right double quotation
-            '\u2032': "'",  # prime
-            '\u2033': '"',  # double prime
-            
-            # Spaces and Breaks
-            '\u00A0': ' ',  # non-breaking space
-            '\u200B': '',   # zero-width space
-            '\u200C': '',   # zero-width non-joiner
-            '\u200D': '',   # zero-width joiner
-            '\u2028': '\n', # line separator
-            '\u2029': '\n', # paragraph separator
-            
-            # Symbols
-            '\u2022': '•',  # bullet
-            '\u2023': '•',  # triangular bullet
-            '\u25CF': '•',  # black circle
-            '\u25CB': '○',  # white circle
-            '\u25AA': '▪',  # black small square
-            '\u25AB': '▫',  # white small square
-            '\u2212': '-',  # minus sign
-            
-            # Common PDF artifacts
-            '\uf0b7': '-',  # PDF bullet
-            '\uf0a7': '-',  # PDF bullet variant
-            '\uf0d8': '-',  # PDF up arrow
-            '\uf0d9': '-',  # PDF left arrow
-            '\uf0da': '-',  # PDF right arrow
-            
-            # Typography
-            '\u2026': '...',  # horizontal ellipsis
-            '\u2122': '(TM)',  # trade mark sign
-            '\u00AE': '(R)',   # registered sign
-            '\u00A9': '(C)',   # copyright sign
-            
-            # Currency
-            '\u20AC': 'EUR',  # euro
-            '\u00A3': 'GBP',  # pound
-            '\u00A5': 'JPY',  # yen
-            '\u20B9': 'INR',  # rupee
-        }
-        
-        # Apply replacements
-        for old, new in replacements.items():
+        # Apply replacements; str.replace returns the text itself when a character
+        # does not occur, which is the common case for each of them
+        for old, new in _CLEAN_TEXT_REPLACEMENTS.items():
             text = text.replace(old, new)
         
         return text
@@ -211,58 +444,15 @@ class ResumeAnalyzerAgent(BaseAgent):
         # Clean special characters first
         text = self.clean_extracted_text(text)
         
-        # Advanced date normalization
-        date_patterns = {
-            r'(jan|january|Jan|January)': '01',
-            r'(feb|february|Feb|February)': '02',
-            r'(mar|march|Mar|March)': '03',
-            r'(apr|april|Apr|April)': '04',
-            r'(may|May)': '05',
-            r'(jun|june|Jun|June)': '06',
-            r'(jul|july|Jul|July)': '07',
-            r'(aug|august|Aug|August)': '08',
-            r'(sep|september|Sep|September)': '09',
-            r'(oct|october|Oct|October)': '10',
-            r'(nov|november|Nov|November)': '11',
-            r'(dec|december|Dec|December)': '12'
-        }
-        
-        for pattern, replacement in date_patterns.items():
-            text = re.sub(pattern, replacement, text)
-        
-        # Normalize education degrees
-        degree_patterns = {
-            r'b\.?tech\.?': 'Bachelor of Technology',
-            r'm\.?tech\.?': 'Master of Technology',
-            r'b\.?e\.?': 'Bachelor of Engineering',
-            r'm\.?e\.?': 'Master of Engineering',
-            r'b\.?sc\.?': 'Bachelor of Science',
-            r'm\.?sc\.?': 'Master of Science',
-            r'ph\.?d\.?': 'Doctor of Philosophy',
-            r'mba': 'Master of Business Administration'
-        }
-        
-        for pattern, replacement in degree_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        
-        # Normalize job titles
-        title_patterns = {
-            r'sr\.?\s*': 'Senior ',
-            r'jr\.?\s*': 'Junior ',
-            r'mgr\.?\s*': 'Manager ',
-            r'dir\.?\s*': 'Director ',
-            r'exec\.?\s*': 'Executive ',
-            r'asst\.?\s*': 'Assistant ',
-            r'assoc\.?\s*': 'Associate '
-        }
-        
-        for pattern, replacement in title_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        # Normalize dates, education degrees and job titles
+        text = _MONTH_RE.sub(_month_number, text)
+        text = _DEGREE_RE.sub(_degree_name, text)
+        text = _TITLE_RE.sub(_title_name, text)
         
         # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single space
-        text = re.sub(r'\n\s*\n', '\n\n', text)  # Multiple newlines to double newline
-        text = re.sub(r'^\s+|\s+$', '', text, flags=re.MULTILINE)  # Trim lines
+        text = _WHITESPACE_RE.sub(' ', text)  # Multiple spaces to single space
+        text = _BLANK_LINES_RE.sub('\n\n', text)  # Multiple newlines to double newline
+        text = _LINE_EDGE_SPACE_RE.sub('', text)  # Trim lines
         
         return text.strip()
 
@@ -293,19 +483,11 @@ class ResumeAnalyzerAgent(BaseAgent):
             if not line:
                 continue
             
-            # Debug log
-            self._log(f"Processing line: {line[:50]}...")
-            
             # Check for section headers
-            for section, pattern in self.section_patterns.items():
-                if re.search(pattern['headers'][0], line, re.I):
-                    current_section = section
-                    if section == 'skills':
-                        in_skills_section = True
-                    else:
-                        in_skills_section = False
-                    self._log(f"Found section header: {section}")
-                    break
+            header = self._section_header_re.match(line)
+            if header:
+                current_section = header.lastgroup
+                in_skills_section = current_section == 'skills'
             
             # Process line based on current section
             if current_section:
@@ -320,15 +502,12 @@ class ResumeAnalyzerAgent(BaseAgent):
                 else:
                     sections[current_section].append(line)
         
-        # Additional skill extraction from entire text
-        # Split text into chunks and look for skills
-        chunks = text.split()
-        for i in range(len(chunks)):
-            chunk = ' '.join(chunks[max(0, i-2):min(len(chunks), i+3)])  # Context window
-            self._extract_skills(chunk, sections['skills'])
+        # Additional skill extraction from entire text, one scan per skill category
+        self._extract_skills(text, sections['skills'])
         
         # Debug log final results
-        self._log(f"Final extracted sections: {sections}")
+        if self.verbose:
+            self._log(f"Final extracted sections: {sections}")
         
         return sections
 
@@ -350,11 +529,11 @@ class ResumeAnalyzerAgent(BaseAgent):
                 continue
             
             # Check for section headers
-            for section, patterns in self.section_patterns.items():
+            for section, headers in self._section_header_res.items():
                 # Check header patterns
-                header_match = any(re.match(pattern, line) for pattern in patterns['headers'])
+                header_match = any(header.match(line) for header in headers)
                 # Check indicators
-                indicator_match = any(re.search(pattern, line) for pattern in patterns['indicators'])
+                indicator_match = any(indicator.search(line) for indicator in self._section_indicator_res[section])
                 
                 if header_match or indicator_match:
                     # Save previous section if exists
@@ -421,11 +600,9 @@ class ResumeAnalyzerAgent(BaseAgent):
         ]
         
         # Extract skills using patterns
-        print("\n--- SKILLS EXTRACTION USING PATTERN MATCHING ---")
         for pattern in tech_patterns:
             matches = re.findall(pattern, text, re.IGNORECASE)
             if matches:
-                print(f"Pattern matches: {matches}")
                 skills.update([match.lower() for match in matches])
         
         # Look for skills in context (e.g., "proficient in X", "experience with Y")
@@ -444,28 +621,20 @@ class ResumeAnalyzerAgent(BaseAgent):
                     skill = skill.strip().lower()
                     if skill and len(skill) > 2 and skill not in ['and', 'the', 'in', 'with', 'of', 'for', 'to', 'on', 'at']:
                         skills.add(skill)
-                        print(f"Context pattern match: {skill}")
         
-        # Print final results
-        print(f"Total skills found: {len(skills)}")
-        print(f"Skills: {skills}")
-        print("-------------------------------------------\n")
+        # Debug log final results
+        if self.verbose:
+            self._log(f"Pattern matching found {len(skills)} skills: {skills}")
         
         return skills
 
     def _extract_skills(self, text: str, skills_set: set) -> None:
         """Extract skills from text using pattern matching"""
         text = text.lower()
-        self._log(f"Extracting skills from text: {text[:100]}...")  # Log first 100 chars
-        
-        # Check for skills in each category
-        for category, skill_list in self.tech_skills_patterns.items():
-            for skill in skill_list:
-                if skill in text:
-                    skills_set.add(skill)
-                    self._log(f"Found skill: {skill} in category: {category}")
         
-        self._log(f"Current skills set: {skills_set}")
+        # Check for skills in each category, one scan of the text per category
+        for pattern in self._tech_skill_category_res.values():
+            skills_set.update(match.group() for match in pattern.finditer(text))
 
     def extract_skills_with_context(self, text: str) -> Dict[str, List[Dict]]:
         """Enhanced skill extraction with context"""
@@ -478,11 +647,10 @@ class ResumeAnalyzerAgent(BaseAgent):
             context_before = lines[i-1] if i > 0 else ""
             context_after = lines[i+1] if i < len(lines)-1 else ""
             
-            for category, skill_list in self.tech_skills_patterns.items():
+            for category, patterns in self._tech_skill_res.items():
                 # Check patterns
-                for pattern in skill_list:
-                    matches = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches:
+                for pattern in patterns:
+                    for match in pattern.finditer(line):
                         skill = match.group(0)
                         skills[category].append({
                             'skill': skill,
@@ -594,8 +762,7 @@ class ResumeAnalyzerAgent(BaseAgent):
             if (
                 len(skill) > 2 and  # Longer than 2 characters
                 skill not in self.invalid_skills and  # Not in invalid list
-                not skill.isnumeric() and  # Not just numbers
-                not all(c.isdigit() or c.isspace() for c in skill)  # Not just digits and spaces
+                not skill.replace(' ', '').isnumeric()  # Not just numbers and spaces
             ):
                 validated.add(skill)
         return validated
@@ -660,12 +827,14 @@ class ResumeAnalyzerAgent(BaseAgent):
             
             # Section identification check
             required_sections = ['education', 'experience', 'skills']
-            found_sections = []
-            for section in required_sections:
-                if re.search(self.section_patterns[section]['headers'][0], text, re.I):
-                    found_sections.append(section)
+            # Headers are whole lines, so each line is matched the way extract_sections does
+            found_sections = set()
+            for line in text.splitlines():
+                header = self._section_header_re.match(line.strip())
+                if header:
+                    found_sections.add(header.lastgroup)
             
-            missing_sections = set(required_sections) - set(found_sections)
+            missing_sections = set(required_sections) - found_sections
             if missing_sections:
                 validation_report["warnings"].append(
                     f"Missing sections: {', '.join(missing_sections)}"
@@ -678,7 +847,9 @@ class ResumeAnalyzerAgent(BaseAgent):
                 )
             
             # Identify special characters
-            special_chars = set(char for char in text if not char.isascii())
+            # str.isascii() is answered from the string's storage kind without a
+            # scan, so pure-ASCII resumes skip the search entirely
+            special_chars = set() if text.isascii() else set(_NON_ASCII_RE.findall(text))
             if special_chars:
                 validation_report["stats"]["special_chars_found"] = special_chars
                 validation_report["warnings"].append(
@@ -726,7 +897,7 @@ class ResumeAnalyzerAgent(BaseAgent):
             # Clean up the response to get just the role
             role = response.strip()
             
-            print(f"LLM Extracted Current Role: {role}")
+            self._log(f"LLM Extracted Current Role: {role}")
             return role
         except Exception as e:
             self._log(f"LLM current role extraction error: {str(e)}")
@@ -743,12 +914,13 @@ class ResumeAnalyzerAgent(BaseAgent):
                 "confidence": "pattern"
             }
             
-            # Print the results to the console
-            print("Pattern Matching Results:")
-            print(f"Current Role: {results['current_role']}")
-            print(f"Experience: {results['experience']}")
-            print(f"Skills: {results['skills']}")
-            print(f"Education: {results['education']}")
+            # Debug log the results
+            if self.verbose:
+                self._log(
+                    f"Pattern matching results - Current Role: {results['current_role']}, "
+                    f"Experience: {results['experience']}, Skills: {results['skills']}, "
+                    f"Education: {results['education']}"
+                )
             
             return results
         except Exception as e:
@@ -758,25 +930,10 @@ class ResumeAnalyzerAgent(BaseAgent):
     def _llm_based_analysis(self, text: str) -> Dict[str, Any]:
         """LLM-based analysis with structured output"""
         try:
-            prompt = f"""
-            Analyze the following resume text and extract key information in a structured format:
-
-            {text}
-
-            Please provide the following information in a structured format:
-            1. Current Role: [Most recent/current position]
-            2. Years of Experience: [Total years of professional experience]
-            3. Skills: [List of technical and soft skills, excluding single letters or common words]
-            4. Education: [List of educational qualifications]
-            5. Professional Summary: [Brief professional summary]
-
-            Format the response as:
-            CURRENT_ROLE: [role]
-            EXPERIENCE: [years]
-            SKILLS: [skill1, skill2, ...]
-            EDUCATION: [edu1, edu2, ...]
-            SUMMARY: [summary]
-            """
+            prompt = [
+                _RESUME_ANALYSIS_SYSTEM_MESSAGE,
+                HumanMessage(content=_RESUME_ANALYSIS_TEMPLATE.format(text=text))
+            ]
 
             response = self.llm.invoke(prompt).content
             parsed_results = self._parse_llm_response(response)
@@ -853,14 +1010,9 @@ class ResumeAnalyzerAgent(BaseAgent):
 
     def _normalize_experience(self, exp: str) -> str:
         """Normalize experience to years"""
-        try:
-            # Extract numbers from string
-            numbers = re.findall(r'\d+', str(exp))
-            if numbers:
-                return numbers[0]
-            return ""
-        except:
-            return ""
+        # First number in the string
+        match = re.search(r'\d+', str(exp))
+        return match.group() if match else ""
 
     def _get_best_available_results(self, pattern_results: Dict, llm_results: Dict) -> Dict:
         """Return best available results if either analysis fails"""
@@ -916,8 +1068,15 @@ class ResumeAnalyzerAgent(BaseAgent):
     def process_resume(self, file_path: str) -> Dict:
         """Process resume and return structured data"""
         try:
-            # Extract text from PDF
-            text = self.extract_text_from_pdf(file_path)
+            # The same file uploaded again (e.g. on every Streamlit rerun) reuses
+            # the result of its first analysis
+            data, cache_key = self._read_pdf(file_path)
+            if cache_key in self._resume_result_cache:
+                self._resume_result_cache.move_to_end(cache_key)
+                return copy.deepcopy(self._resume_result_cache[cache_key])
+            
+            # Extract text from PDF, reusing the bytes and hash read above
+            text = self._extract_text_from_bytes(data, cache_key)
             
             # Extract sections
             sections = self.extract_sections(text)
@@ -956,11 +1115,15 @@ class ResumeAnalyzerAgent(BaseAgent):
             # Generate feedback
             feedback = self._generate_feedback(structured_data)
             
-            return {
+            result = {
                 'structured_data': structured_data,
                 'feedback': feedback
             }
             
+            self._resume_result_cache[cache_key] = copy.deepcopy(result)
+            self._manage_cache_size(self._resume_result_cache)
+            return result
+            
         except Exception as e:
             self._log(f"Error processing resume: {str(e)}")
             raise
@@ -968,103 +1131,56 @@ class ResumeAnalyzerAgent(BaseAgent):
     def analyze_sections(self, sections: Dict) -> Dict:
         """Enhanced LLM analysis with more specific prompts"""
         try:
-            prompt = f"""
-            Analyze the following resume sections and provide detailed insights:
-            
-            PROFESSIONAL SUMMARY:
-            {sections['summary']}
-            
-            WORK EXPERIENCE:
-            {' | '.join(sections['experience'])}
-            
-            EDUCATION:
-            {' | '.join(sections['education'])}
-            
-            SKILLS:
-            {', '.join(sections['skills'])}
-            
-            Please provide a structured analysis in the following format:
-            
-            PROFESSIONAL_SUMMARY:
-            [Write a compelling 2-3 sentence summary highlighting key experience, skills, and career trajectory]
-            
-            KEY_STRENGTHS:
-            - [Strength 1: Specific example from experience]
-            - [Strength 2: Specific example from experience]
-            - [Strength 3: Technical expertise demonstration]
-            
-            CAREER_PROGRESSION:
-            - [Analysis of career growth and progression]
-            - [Pattern in role changes and responsibilities]
-            
-            TECHNICAL_ASSESSMENT:
-            - [Evaluation of technical skills relevance]
-            - [Identification of skill gaps]
-            - [Technology stack analysis]
-            
-            AREAS_FOR_IMPROVEMENT:
-            - [Specific improvement 1 with actionable suggestion]
-            - [Specific improvement 2 with actionable suggestion]
-            - [Skill gap closure recommendation]
-            
-            RECOMMENDATIONS:
-            - [Career development suggestion 1]
-            - [Skill enhancement priority 1]
-            - [Industry-specific recommendation]
-            """
+            prompt = [
+                _SECTION_ANALYSIS_SYSTEM_MESSAGE,
+                HumanMessage(content=_SECTION_ANALYSIS_TEMPLATE.format(
+                    summary=sections['summary'],
+                    experience=' | '.join(sections['experience']),
+                    education=' | '.join(sections['education']),
+                    skills=', '.join(sections['skills'])
+                ))
+            ]
             
             response = self.llm.invoke(prompt).content
             
-            # Enhanced response parsing
-            analysis = {
-                "summary": "",
-                "strengths": [],
-                "career_progression": [],
-                "technical_assessment": [],
-                "improvements": [],
-                "recommendations": []
-            }
-            
-            current_section = None
-            for line in response.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Enhanced section matching
-                section_matches = {
-                    "PROFESSIONAL_SUMMARY": "summary",
-                    "KEY_STRENGTHS": "strengths",
-                    "CAREER_PROGRESSION": "career_progression",
-                    "TECHNICAL_ASSESSMENT": "technical_assessment",
-                    "AREAS_FOR_IMPROVEMENT": "improvements",
-                    "RECOMMENDATIONS": "recommendations"
-                }
-                
-                for marker, section in section_matches.items():
-                    if marker in line:
-                        current_section = section
-                        break
-                
-                if current_section and not any(marker in line for marker in section_matches):
-                    if current_section == "summary":
-                        analysis["summary"] += line + " "
-                    else:
-                        analysis[current_section].append(line.lstrip('- '))
-            
-            return analysis
+            return self._parse_section_analysis(response)
             
         except Exception as e:
             self._log(f"Error in LLM analysis: {str(e)}")
             return {}
 
+    def _parse_section_analysis(self, response: str) -> Dict:
+        """Parse the section analysis response, slicing it at each header in one pass"""
+        analysis = {
+            "summary": "",
+            "strengths": [],
+            "career_progression": [],
+            "technical_assessment": [],
+            "improvements": [],
+            "recommendations": []
+        }
+        
+        summary_lines = []
+        headers = list(_SECTION_ANALYSIS_HEADER_RE.finditer(response))
+        for i, header in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(response)
+            section = _SECTION_ANALYSIS_KEYS[header.group(1)]
+            lines = [line.strip() for line in response[header.end():end].splitlines() if line.strip()]
+            if section == "summary":
+                summary_lines.extend(lines)
+            else:
+                analysis[section].extend(strip_bullet(line) for line in lines)
+        
+        analysis["summary"] = " ".join(summary_lines)
+        return analysis
+
     def _calculate_section_confidence(self, section: str, content: str) -> float:
         """Calculate confidence score for section detection"""
         confidence = 0.5  # Base confidence
         
         # Check for section-specific indicators
-        indicators = self.section_patterns[section]['indicators']
-        indicator_matches = sum(1 for indicator in indicators if re.search(indicator, content, re.IGNORECASE))
+        indicators = self._section_indicator_res[section]
+        indicator_matches = sum(1 for indicator in indicators if indicator.search(content))
         confidence += 0.1 * indicator_matches
         
         # Check content length
@@ -1088,26 +1204,29 @@ class ResumeAnalyzerAgent(BaseAgent):
             if not line:
                 continue
             
-            # Check for section headers
-            if line.startswith('CURRENT_ROLE:'):
-                current_section = "current_role"
-                parsed["current_role"] = line.replace('CURRENT_ROLE:', '').strip()
-            elif line.startswith('EXPERIENCE:'):
-                current_section = "experience"
-                parsed["experience"] = line.replace('EXPERIENCE:', '').strip()
-            elif line.startswith('SKILLS:'):
-                current_section = "skills"
-                skills = line.replace('SKILLS:', '').strip()
-                parsed["skills"] = {s.strip() for s in skills.split(',') if s.strip()}
-            elif line.startswith('EDUCATION:'):
-                current_section = "education"
-                education = line.replace('EDUCATION:', '').strip()
-                parsed["education"] = [e.strip() for e in education.split(',') if e.strip()]
-            elif line.startswith('SUMMARY:'):
-                current_section = "professional_summary"
-                parsed["professional_summary"] = line.replace('SUMMARY:', '').strip()
+            # Check for section headers ("SKILLS: ...") with one dict lookup
+            header, sep, value = line.partition(':')
+            section = _LLM_RESPONSE_FIELDS.get(header) if sep else None
+            if section:
+                current_section = section
+                value = value.strip()
+                if section == "skills":
+                    parsed["skills"] = {s.strip() for s in value.split(',') if s.strip()}
+                elif section == "education":
+                    parsed["education"] = [e.strip() for e in value.split(',') if e.strip()]
+                else:
+                    parsed[section] = value
             elif current_section == "professional_summary":
                 parsed["professional_summary"] += " " + line
+            elif current_section in ("skills", "education") and line[0] in "-*•–":
+                # Items listed one per bullet line under the header
+                item = strip_bullet(line)
+                if not item:
+                    continue
+                if current_section == "skills":
+                    parsed["skills"].add(item)
+                else:
+                    parsed["education"].append(item)
         
         return parsed
 
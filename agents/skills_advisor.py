@@ -2,13 +2,96 @@ import datetime
 import json
 import os
 import traceback  # Add import for traceback
-from typing import Dict, List, Any, Optional
-from .base_agent import BaseAgent
-from langchain.prompts import PromptTemplate
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+from .base_agent import BaseAgent, bullet_list
 import re
 import uuid
 
+_SKILLS_ANALYSIS_PROMPT = """
+    Analyze the skill gap between current skills and target role requirements:
+    
+    Current Skills:
+    {current_skills}
+    
+    Target Role:
+    {target_role}
+    
+    Job Requirements:
+    {job_requirements}
+    
+    Please provide a DETAILED analysis with the following sections (be specific and comprehensive):
+    
+    1. Skill Gap Analysis:
+    - Identify ALL missing skills required for the target role
+    - For each skill gap, briefly explain its importance
+    
+    2. Priority Skills to Develop:
+    - List at least 3-5 most critical skills to focus on first
+    - For each priority skill, explain why it's important
+    
+    3. Learning Resources and Timeline:
+    - Provide at least 5 SPECIFIC learning resources (include actual course names, book titles, platforms)
+    - Include links or platforms where these resources can be found
+    - Suggest estimated timeline for acquiring each priority skill
+    
+    4. Career Transition Strategy:
+    - Outline at least 5 concrete steps to transition to the target role
+    - Include networking strategies, portfolio development, and interview preparation advice
+    
+    Make your response detailed, specific, and immediately actionable.
+    """
+
+_LEARNING_PATH_PROMPT = """
+    Create a detailed learning path for skill development:
+    
+    Skill: {skill}
+    Current Level: {current_level}
+    Target Level: {target_level}
+    
+    Please provide a structured response with the following sections, using bullet points for each item:
+    
+    1. Learning Objectives:
+    - [List specific, measurable objectives]
+    
+    2. Recommended Resources:
+    - [List courses, books, tutorials, documentation]
+    
+    3. Timeline and Milestones:
+    - [Break down into weekly or monthly goals]
+    
+    4. Practice Exercises:
+    - [List specific exercises and projects]
+    
+    5. Assessment Criteria:
+    - [List ways to measure progress]
+    
+    Make sure each section has at least 3-5 detailed items.
+    """
+
+# Bound ``str.format`` of the template above, called directly on the hot path
+_SKILLS_ANALYSIS_FMT = _SKILLS_ANALYSIS_PROMPT.format
+
+@lru_cache(maxsize=128)
+def _format_skills_analysis_prompt(
+    current_skills: Tuple[str, ...],
+    target_role: str,
+    job_requirements: Tuple[str, ...]
+) -> str:
+    """Format the skills analysis prompt once per distinct request"""
+    return _SKILLS_ANALYSIS_FMT(
+        current_skills=bullet_list(current_skills),
+        target_role=target_role,
+        job_requirements=bullet_list(job_requirements)
+    )
+
 class SkillsAdvisorAgent(BaseAgent):
+    # Fields required by validate_input
+    _REQUIRED_FIELDS = frozenset({"current_skills", "target_role"})
+    
+    skills_analysis_prompt = _SKILLS_ANALYSIS_PROMPT
+    learning_path_prompt = _LEARNING_PATH_PROMPT
+    
     def __init__(self, verbose: bool = False, user_data_path: str = None):
         super().__init__(
             role="Skills Development Advisor",
@@ -27,73 +110,6 @@ class SkillsAdvisorAgent(BaseAgent):
         # Active learning paths and progress tracking
         self.learning_paths = {}
         self.skill_progress = {}
-        
-        self.skills_analysis_prompt = PromptTemplate(
-            input_variables=["current_skills", "target_role", "job_requirements"],
-            template="""
-            Analyze the skill gap between current skills and target role requirements:
-            
-            Current Skills:
-            {current_skills}
-            
-            Target Role:
-            {target_role}
-            
-            Job Requirements:
-            {job_requirements}
-            
-            Please provide a DETAILED analysis with the following sections (be specific and comprehensive):
-            
-            1. Skill Gap Analysis:
-            - Identify ALL missing skills required for the target role
-            - For each skill gap, briefly explain its importance
-            
-            2. Priority Skills to Develop:
-            - List at least 3-5 most critical skills to focus on first
-            - For each priority skill, explain why it's important
-            
-            3. Learning Resources and Timeline:
-            - Provide at least 5 SPECIFIC learning resources (include actual course names, book titles, platforms)
-            - Include links or platforms where these resources can be found
-            - Suggest estimated timeline for acquiring each priority skill
-            
-            4. Career Transition Strategy:
-            - Outline at least 5 concrete steps to transition to the target role
-            - Include networking strategies, portfolio development, and interview preparation advice
-            
-            Make your response detailed, specific, and immediately actionable.
-            """
-        )
-        
-        self.learning_path_prompt = PromptTemplate(
-            input_variables=["skill", "current_level", "target_level"],
-            template="""
-            Create a detailed learning path for skill development:
-            
-            Skill: {skill}
-            Current Level: {current_level}
-            Target Level: {target_level}
-            
-            Please provide a structured response with the following sections, using bullet points for each item:
-            
-            1. Learning Objectives:
-            - [List specific, measurable objectives]
-            
-            2. Recommended Resources:
-            - [List courses, books, tutorials, documentation]
-            
-            3. Timeline and Milestones:
-            - [Break down into weekly or monthly goals]
-            
-            4. Practice Exercises:
-            - [List specific exercises and projects]
-            
-            5. Assessment Criteria:
-            - [List ways to measure progress]
-            
-            Make sure each section has at least 3-5 detailed items.
-            """
-        )
     
     def analyze_skill_gaps(
         self,
@@ -115,17 +131,9 @@ class SkillsAdvisorAgent(BaseAgent):
             Dict: Skill gap analysis and recommendations
         """
         try:
-            # Format inputs for prompt
-            current_skills_text = "\n".join(f"- {skill}" for skill in current_skills)
-            requirements_text = "\n".join(f"- {req}" for req in job_requirements)
-            
             # Get analysis from LLM using invoke instead of predict
             response = self.llm.invoke(
-                self.skills_analysis_prompt.format(
-                    current_skills=current_skills_text,
-                    target_role=target_role,
-                    job_requirements=requirements_text
-                )
+                _format_skills_analysis_prompt(tuple(current_skills), target_role, tuple(job_requirements))
             ).content
             
             # Parse and structure the response
@@ -730,10 +738,6 @@ class SkillsAdvisorAgent(BaseAgent):
         
         return parsed_data
     
-    def get_required_fields(self) -> List[str]:
-        """Get required fields for skills analysis"""
-        return ["current_skills", "target_role"]
-    
     def set_user_profile(self, profile_data: Dict[str, Any]) -> None:
         """Set or update the user profile data"""
         self.user_profile = profile_data
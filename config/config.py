@@ -27,12 +27,16 @@ class Config:
     
     # Application Settings
     MAX_RESUME_SIZE_MB = 5
+    MAX_RESUME_PAGES = 5  # Pages of a PDF resume read for text extraction
     SUPPORTED_RESUME_FORMATS = [".pdf", ".docx"]
     MAX_JOBS_PER_SEARCH = 10
     
     # Model Settings
     DEFAULT_GPT_MODEL = "gpt-3.5-turbo"
+    FAST_GPT_MODEL = "gpt-4o-mini"  # Smaller model for factual lookups (resources, role analysis)
     EMBEDDING_MODEL = "text-embedding-3-small"
+    LLM_MAX_CONCURRENCY = 4  # Parallel requests per batched LLM call
+    CHAT_HISTORY_TOKEN_BUDGET = 2000  # Max tokens of chat history sent with a question
     
     # Vector Database Settings
     VECTOR_DB_DIMENSION = 1536  # OpenAI embedding dimension
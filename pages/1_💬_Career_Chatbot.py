@@ -189,16 +189,19 @@ def process_user_input(user_input, chatbot):
             # Get context for personalized responses
             user_context = st.session_state.user_context
             
-            # Get recent history
-            recent_history = []
-            if st.session_state.chat_history:
-                recent_history = st.session_state.chat_history[-5:]
+            # Get chatbot response, showing the text as it is generated
+            placeholder = st.empty()
+            streamed = []
+            
+            def show_token(token):
+                streamed.append(token)
+                placeholder.markdown("".join(streamed))
             
-            # Get chatbot response
             response_data = chatbot.get_response(
                 user_input,
-                chat_history=recent_history,
-                user_context=user_context
+                chat_history=st.session_state.chat_history,
+                user_context=user_context,
+                on_token=show_token
             )
             
             # Extract response text
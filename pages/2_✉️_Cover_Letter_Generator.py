@@ -56,12 +56,22 @@ def main():
     # Generate cover letter
     if generate_button and job_description and company_name:
         with st.spinner("Generating your cover letter..."):
+            # Show the letter as it is generated, then replace it with the formatted version
+            placeholder = st.empty()
+            streamed = []
+            
+            def show_token(token):
+                streamed.append(token)
+                placeholder.markdown("".join(streamed))
+            
             cover_letter = generator.generate_cover_letter(
                 job_description=job_description,
                 candidate_info=candidate_info,
                 company_name=company_name,
-                style=style
+                style=style,
+                on_token=show_token
             )
+            placeholder.empty()
             
             # Display the generated cover letter
             st.header("Generated Cover Letter")
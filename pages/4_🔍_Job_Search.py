@@ -77,71 +77,85 @@ def main():
                     max_results=max_results
                 )
                 
-                # Store results in session state
+                # Store results in session state, so they stay on the page when a
+                # button below reruns the script; fit analyses belong to one search
                 st.session_state.job_search_results = jobs
+                st.session_state.job_fit_analyses = {}
                 
                 # Display results
                 st.success(f"Found {len(jobs)} matching jobs!")
                 
-                # Display each job
-                for job in jobs:
-                    with st.expander(f"{job['title']} at {job['company']}"):
-                        # Job details
-                        st.write(f"**Location:** {job['location']}")
-                        if job['salary_min'] and job['salary_max']:
-                            st.write(f"**Salary Range:** ${job['salary_min']:,.2f} - ${job['salary_max']:,.2f}")
-                        
-                        # Job description
-                        st.write("**Description:**")
-                        st.write(job['description'])
-                        
-                        # Application link
-                        st.write(f"**Apply Here:** {job['url']}")
-                        
-                        # Job fit analysis
-                        if st.session_state.user_context.get("skills"):
-                            if st.button(f"Analyze Fit for {job['title']}", key=f"fit_{jobs.index(job)}"):
-                                with st.spinner("Analyzing job fit..."):
-                                    fit_analysis = job_searcher.analyze_job_fit(
+            except Exception as e:
+                st.error(f"Error searching jobs: {str(e)}")
+    
+    # Display each job from the latest search
+    jobs = st.session_state.get("job_search_results")
+    if jobs:
+        if "job_fit_analyses" not in st.session_state:
+            st.session_state.job_fit_analyses = {}
+        fit_analyses = st.session_state.job_fit_analyses
+        
+        for index, job in enumerate(jobs):
+            with st.expander(f"{job['title']} at {job['company']}"):
+                # Job details
+                st.write(f"**Location:** {job['location']}")
+                if job['salary_min'] and job['salary_max']:
+                    st.write(f"**Salary Range:** ${job['salary_min']:,.2f} - ${job['salary_max']:,.2f}")
+                
+                # Job description
+                st.write("**Description:**")
+                st.write(job['description'])
+                
+                # Application link
+                st.write(f"**Apply Here:** {job['url']}")
+                
+                # Job fit analysis, run only when requested for this job
+                if st.session_state.user_context.get("skills"):
+                    if index not in fit_analyses:
+                        if st.button(f"Analyze Fit for {job['title']}", key=f"fit_{index}"):
+                            with st.spinner("Analyzing job fit..."):
+                                try:
+                                    fit_analyses[index] = job_searcher.analyze_job_fit(
                                         job_description=job['description'],
                                         user_skills=st.session_state.user_context["skills"]
                                     )
-                                    
-                                    # Display fit analysis
-                                    col1, col2, col3 = st.columns(3)
-                                    
-                                    with col1:
-                                        st.metric(
-                                            "Match Score",
-                                            f"{fit_analysis['structured_data']['match_score']}%"
-                                        )
-                                    
-                                    with col2:
-                                        st.write("**Matching Skills:**")
-                                        for skill in fit_analysis['structured_data']['matching_skills']:
-                                            st.success(f"✓ {skill}")
-                                    
-                                    with col3:
-                                        st.write("**Skills to Develop:**")
-                                        for skill in fit_analysis['structured_data']['missing_skills']:
-                                            st.info(f"↗ {skill}")
-                                    
-                                    # Recommendations
-                                    st.write("**Recommendations:**")
-                                    for rec in fit_analysis['structured_data']['recommendations']:
-                                        st.write(f"• {rec}")
-                        else:
-                            st.warning("Complete your profile with skills to get a job fit analysis!")
-                
-                # Save jobs feature
-                if st.button("Save Search Results"):
-                    if "saved_jobs" not in st.session_state:
-                        st.session_state.saved_jobs = []
-                    st.session_state.saved_jobs.extend(jobs)
-                    st.success("Jobs saved to your profile!")
-                
-            except Exception as e:
-                st.error(f"Error searching jobs: {str(e)}")
+                                except Exception as e:
+                                    st.error(f"Error analyzing job fit: {str(e)}")
+                    
+                    fit_analysis = fit_analyses.get(index)
+                    if fit_analysis:
+                        # Display fit analysis
+                        col1, col2, col3 = st.columns(3)
+                        
+                        with col1:
+                            st.metric(
+                                "Match Score",
+                                f"{fit_analysis['structured_data']['match_score']}%"
+                            )
+                        
+                        with col2:
+                            st.write("**Matching Skills:**")
+                            for skill in fit_analysis['structured_data']['matching_skills']:
+                                st.success(f"✓ {skill}")
+                        
+                        with col3:
+                            st.write("**Skills to Develop:**")
+                            for skill in fit_analysis['structured_data']['missing_skills']:
+                                st.info(f"↗ {skill}")
+                        
+                        # Recommendations
+                        st.write("**Recommendations:**")
+                        for rec in fit_analysis['structured_data']['recommendations']:
+                            st.write(f"• {rec}")
+                else:
+                    st.warning("Complete your profile with skills to get a job fit analysis!")
+        
+        # Save jobs feature
+        if st.button("Save Search Results"):
+            if "saved_jobs" not in st.session_state:
+                st.session_state.saved_jobs = []
+            st.session_state.saved_jobs.extend(jobs)
+            st.success("Jobs saved to your profile!")
     
     # Saved jobs section in sidebar
     with st.sidebar:
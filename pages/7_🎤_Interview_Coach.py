@@ -43,6 +43,21 @@ def initialize_session_state():
     if "saved_interviews" not in st.session_state:
         st.session_state.saved_interviews = []
 
+def format_feedback(feedback: Dict) -> str:
+    """Format an evaluation (possibly still being generated) as markdown"""
+    data = feedback.get("structured_data", {})
+    parts = []
+    if data.get("score") is not None:
+        parts.append(f"**Response Score:** {data['score']}%")
+    for title, key in (("Strengths", "strengths"), ("Areas for Improvement", "improvements")):
+        if data.get(key):
+            parts.append(f"**{title}:**\n" + "\n".join(f"- {item}" for item in data[key]))
+    if data.get("better_response"):
+        parts.append(f"**Sample Better Response:**\n{data['better_response']}")
+    if data.get("tips"):
+        parts.append("**Additional Tips:**\n" + "\n".join(f"- {tip}" for tip in data["tips"]))
+    return "\n\n".join(parts)
+
 def main():
     st.title("🎤 Interview Coach")
     
@@ -245,13 +260,16 @@ def main():
                         if st.button("Generate Feedback Now", type="primary"):
                             with st.spinner("Analyzing your response..."):
                                 try:
-                                    # Get feedback
-                                    feedback = coach.evaluate_response(
+                                    # Get feedback, showing it as it is generated
+                                    placeholder = st.empty()
+                                    for feedback in coach.evaluate_response_stream(
                                         question=all_questions[current_idx],
                                         answer=st.session_state.current_interview["answers"][current_idx],
                                         role=role,
                                         experience_level=experience_level
-                                    )
+                                    ):
+                                        placeholder.markdown(format_feedback(feedback))
+                                    placeholder.empty()
                                     
                                     # Store feedback
                                     st.session_state.current_interview["feedback"][current_idx] = feedback
@@ -268,15 +286,18 @@ def main():
                         not st.session_state.current_interview.get("feedback")):
                         
                         with st.spinner("Processing all your answers... This may take a moment."):
-                            for q_idx, ans in st.session_state.current_interview["answers"].items():
-                                # Get feedback for each answer
-                                feedback = coach.evaluate_response(
-                                    question=all_questions[int(q_idx)],
-                                    answer=ans,
-                                    role=role,
-                                    experience_level=experience_level
-                                )
-                                # Store feedback
+                            # Evaluate all answers with one batched request
+                            answered = list(st.session_state.current_interview["answers"].items())
+                            feedbacks = coach.evaluate_responses(
+                                [
+                                    {"question": all_questions[int(q_idx)], "answer": ans}
+                                    for q_idx, ans in answered
+                                ],
+                                role=role,
+                                experience_level=experience_level
+                            )
+                            # Store feedback
+                            for (q_idx, _), feedback in zip(answered, feedbacks):
                                 st.session_state.current_interview["feedback"][q_idx] = feedback
                             
                             st.success("All responses evaluated! See feedback in the sidebar.")
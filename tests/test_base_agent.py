@@ -0,0 +1,130 @@
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel, Field
+from agents.base_agent import BaseAgent, parse_score, strip_bullet
+
+class FakeToolModel(FakeMessagesListChatModel):
+    """Fake chat model that answers function calls with its canned messages, counting calls"""
+    calls: int = 0
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, *args, **kwargs):
+        self.calls += 1
+        return super()._generate(*args, **kwargs)
+
+class Score(BaseModel):
+    score: int = Field(description="Score from 0 to 100")
+
+def _tool_call(**args):
+    return AIMessage(content="", tool_calls=[{"name": "Score", "args": args, "id": "call_1"}])
+
+def _agent(*responses):
+    agent = BaseAgent(role="Tester", goal="Test", backstory="Test")
+    agent.llm = FakeToolModel(responses=list(responses))
+    return agent
+
+def _parse_score_text(response):
+    return {"score": parse_score(response)}
+
+_SECTIONS = (("Strengths", "strengths"), ("Overall Score", "score"))
+
+def test_parse_score():
+    assert parse_score("Match Score: 85/100") == 85
+    assert parse_score("**78**/100") == 78
+    assert parse_score("Score: 92%") == 92
+    assert parse_score("Scored in 2024") is None
+    assert parse_score("No score given") is None
+
+def test_strip_bullet():
+    for item in ("- Python", "* Python", "• Python", "– Python", "  -Python  "):
+        assert strip_bullet(item) == "Python"
+    assert strip_bullet("**Python** (advanced)") == "**Python** (advanced)"
+
+def test_group_lines():
+    response = (
+        "Intro text\n"
+        "Overall Score: 80\n"
+        "Strengths:\n"
+        "- Clear structure\n"
+        "- Strengths of the example\n"
+        "\n"
+        "Concrete results"
+    )
+
+    assert BaseAgent._group_lines(response, _SECTIONS) == {
+        "score": ["80"],
+        "strengths": ["- Clear structure", "- Strengths of the example", "Concrete results"]
+    }
+
+def test_group_line_matches_group_lines():
+    response = "**Overall Score:** 75\nStrengths:\n* Concise"
+    sections = {}
+    current = None
+    for line in response.split("\n"):
+        current = BaseAgent._group_line(line, _SECTIONS, sections, current)
+
+    assert sections == BaseAgent._group_lines(response, _SECTIONS) == {"score": ["75"], "strengths": ["* Concise"]}
+
+def test_cached_parse_returns_copies():
+    agent = _agent()
+    calls = []
+
+    def parse_sections(response):
+        calls.append(response)
+        return {"items": response.split()}
+
+    first = agent._cached_parse(parse_sections, "a b")
+    first["items"].append("c")
+    second = agent._cached_parse(parse_sections, "a b")
+
+    assert second == {"items": ["a", "b"]}
+    assert len(calls) == 1
+
+def test_structured_or_parsed_caches_structured_answer():
+    agent = _agent(_tool_call(score=85))
+
+    first = agent._structured_or_parsed("Rate it", Score, ("rate",), _parse_score_text)
+    first[1]["score"] = 0
+    second = agent._structured_or_parsed("Rate it", Score, ("rate",), _parse_score_text)
+
+    assert second == ('{"score":85}', {"score": 85})
+    assert agent.llm.calls == 1
+
+def test_structured_or_parsed_reuses_text_answer():
+    agent = _agent(AIMessage(content="Score: 70"))
+    agent._cached_invoke("Rate it", cache_key=("rate",))
+
+    assert agent._structured_or_parsed("Rate it", Score, ("rate",), _parse_score_text) == ("Score: 70", {"score": 70})
+    assert agent.llm.calls == 1
+
+def test_structured_answer_failing_validation_falls_back_to_text():
+    agent = _agent(_tool_call(score="85/100"), AIMessage(content="Score: 85"))
+
+    response, data = agent._structured_or_parsed("Rate it", Score, ("rate",), _parse_score_text)
+
+    assert response == "Score: 85"
+    assert data == {"score": 85}
+
+def test_structured_or_parsed_batch_falls_back_to_text():
+    agent = _agent(_tool_call(score="85/100"), AIMessage(content="Score: 85"))
+
+    assert agent._structured_or_parsed_batch(["Rate it"], Score, [("rate",)], _parse_score_text) == [
+        ("Score: 85", {"score": 85})
+    ]
+    # The text answer is cached for later single calls
+    assert agent._structured_or_parsed("Rate it", Score, ("rate",), _parse_score_text) == ("Score: 85", {"score": 85})
+    assert agent.llm.calls == 2
+
+if __name__ == "__main__":
+    test_parse_score()
+    test_strip_bullet()
+    test_group_lines()
+    test_group_line_matches_group_lines()
+    test_cached_parse_returns_copies()
+    test_structured_or_parsed_caches_structured_answer()
+    test_structured_or_parsed_reuses_text_answer()
+    test_structured_answer_failing_validation_falls_back_to_text()
+    test_structured_or_parsed_batch_falls_back_to_text()
+    print("All tests passed")
@@ -1,4 +1,4 @@
-from agents.career_chatbot import CareerChatbotAgent
+from agents.career_chatbot import CareerChatbotAgent, _count_tokens
 from config.config import Config
 
 def test_career_chatbot():
@@ -72,6 +72,33 @@ def test_career_chatbot():
     except Exception as e:
         print(f"Error testing Career Chatbot: {str(e)}")
 
+def test_history_prefix_is_stable_across_turns():
+    agent = CareerChatbotAgent()
+    
+    # Turns long enough that the window's history exceeds the token budget
+    turn = {
+        "user": "How do I move from backend development into platform engineering? " * 10,
+        "bot": "Start by owning your team's deployment pipeline and infrastructure code. " * 20
+    }
+    history = [dict(turn, user=f"{i}: {turn['user']}") for i in range(10)]
+    
+    sent = [agent._prompt_history(history[:length]) for length in range(1, len(history) + 1)]
+    
+    # Every prompt fits the budget...
+    for turns in sent:
+        assert turns
+        assert sum(_count_tokens(msg["user"]) + _count_tokens(msg["bot"]) for msg in turns) <= Config.CHAT_HISTORY_TOKEN_BUDGET
+    
+    # ...and between the few jumps of its first turn, each prompt's history is
+    # the previous one with the new turn appended
+    moves = 0
+    for previous, current in zip(sent, sent[1:]):
+        if current[0] is previous[0]:
+            assert current[:-1] == previous
+        else:
+            moves += 1
+    assert 0 < moves <= len(sent) // 3
+
 if __name__ == "__main__":
     # Validate configuration
     Config.validate_config()
@@ -1,5 +1,7 @@
+from langchain_core.messages import AIMessage
 from agents.job_searcher import JobSearchAgent
 from config.config import Config
+from test_base_agent import FakeToolModel
 
 def test_job_search():
     # Initialize the agent
@@ -70,6 +72,35 @@ def test_job_search():
     except Exception as e:
         print(f"Error testing Job Search: {str(e)}")
 
+def _job_fit_call(match_score, skill):
+    return AIMessage(content="", tool_calls=[{
+        "name": "JobFitAnalysis",
+        "args": {
+            "match_score": match_score,
+            "matching_skills": [skill],
+            "missing_skills": [],
+            "recommendations": []
+        },
+        "id": "call_1"
+    }])
+
+def test_analyze_job_fits_reuses_cached_analyses():
+    agent = JobSearchAgent()
+    agent.llm = FakeToolModel(responses=[
+        _job_fit_call(85, "Python"),
+        _job_fit_call(60, "SQL")
+    ])
+    skills = ["Python", "SQL"]
+    
+    single = agent.analyze_job_fit("Backend developer, Python", skills)
+    # The first job is served from analyze_job_fit's cache; only the second is requested
+    fits = agent.analyze_job_fits(["Backend developer, Python", "Data analyst, SQL"], skills)
+    
+    assert fits[0] == single
+    assert fits[1]["structured_data"]["match_score"] == 60
+    assert agent.analyze_job_fit("Data analyst, SQL", skills) == fits[1]
+    assert agent.llm.calls == 2
+
 if __name__ == "__main__":
     # Validate configuration
     Config.validate_config()
@@ -35,6 +35,29 @@ def test_resume_analyzer():
     except Exception as e:
         print(f"Error testing Resume Analyzer: {str(e)}")
 
+def test_validate_extracted_text_finds_section_headers():
+    agent = ResumeAnalyzerAgent()
+    
+    resume_text = "\n".join([
+        "Jane Doe",
+        "Summary",
+        "Backend developer with six years of experience building web services, "
+        "data pipelines and internal tools for growing product teams.",
+        "Experience",
+        "Senior Developer | Acme Corp 2019 - Present",
+        "Led the migration of billing services to Python and PostgreSQL, "
+        "cutting invoice processing time and on-call incidents for the team.",
+        "Education",
+        "Bachelor of Science in Computer Science, State University 2011 - 2015",
+        "Skills",
+        "Python, SQL, Docker, Kubernetes, AWS, Git, Communication, Leadership"
+    ])
+    
+    report = agent.validate_extracted_text(resume_text)
+    
+    assert report["is_valid"]
+    assert not any(warning.startswith("Missing sections") for warning in report["warnings"])
+
 if __name__ == "__main__":
     # Validate configuration
     Config.validate_config()